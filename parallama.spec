@@ -22,13 +22,18 @@ Requires:       ollama
 # Python package dependencies
 Requires:       python3-fastapi >= 0.104.0
 Requires:       python3-uvicorn >= 0.24.0
+Requires:       python3-uvloop >= 0.19.0
+Requires:       python3-httptools >= 0.6.0
 Requires:       python3-pydantic >= 2.4.2
 Requires:       python3-sqlalchemy >= 2.0.23
 Requires:       python3-psycopg2 >= 2.9.9
+Requires:       python3-asyncpg >= 0.29.0
+Requires:       python3-greenlet
 Requires:       python3-jose >= 3.3.0
 Requires:       python3-passlib >= 1.7.4
 Requires:       python3-redis >= 5.0.1
 Requires:       python3-httpx >= 0.25.1
+Requires:       python3-orjson >= 3.9.0
 Requires:       python3-multipart >= 0.0.6
 Requires:       python3-yaml >= 6.0.1
 Requires:       python3-click >= 8.1.0
@@ -21,5 +21,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
+        loop="uvloop",
+        http="httptools",
         log_level="debug"
     )
@@ -1,15 +1,24 @@
 """FastAPI application."""
 
 import logging
-from typing import Dict, List, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
 from ..core.config import get_settings
 from ..core.database import init_db
-from ..gateway.registry import GatewayRegistry
+from ..gateway import (
+    GatewayRegistry,
+    GatewayType,
+    OllamaConfig,
+    OllamaGateway,
+    OpenAIConfig,
+    OpenAIGateway
+)
+from ..gateway.http import close_shared_client, open_shared_client
+from ..gateway.utils import json_response
 from ..middleware.auth import AuthMiddleware
 from ..middleware.rate_limit import RateLimitMiddleware
 
@@ -17,8 +26,29 @@ from ..middleware.rate_limit import RateLimitMiddleware
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Build gateway instances on startup and close them on shutdown."""
+    open_shared_client()
+    GatewayRegistry.register(GatewayType.OLLAMA, OllamaGateway)
+    GatewayRegistry.register(GatewayType.OPENAI, OpenAIGateway)
+
+    configs = {GatewayType.OLLAMA: OllamaConfig.from_env()}
+    try:
+        configs[GatewayType.OPENAI] = OpenAIConfig.from_env()
+    except ValueError as e:
+        logger.info("OpenAI gateway disabled: %s", e)
+
+    GatewayRegistry.initialize_all(configs)
+    yield
+    await GatewayRegistry.close_all()
+    await close_shared_client()
+
 # Create FastAPI app
-app = FastAPI(title="Parallama API")
+app = FastAPI(
+    title="Parallama API",
+    lifespan=lifespan
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -36,9 +66,6 @@ app.add_middleware(RateLimitMiddleware)
 # Initialize database
 init_db()
 
-# Initialize gateway registry
-registry = GatewayRegistry()
-
 # Register routes
 @app.get("/")
 async def root() -> Dict[str, str]:
@@ -56,7 +83,4 @@ async def health() -> Dict[str, str]:
 async def global_exception_handler(request: Request, exc: Exception) -> Response:
     """Global exception handler."""
     logger.exception("Unhandled exception")
-    return JSONResponse(
-        status_code=500,
-        content={"message": "Internal server error"},
-    )
+    return json_response({"message": "Internal server error"}, status_code=500)
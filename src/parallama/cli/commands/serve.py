@@ -5,7 +5,7 @@ import uvicorn
 from typing import Optional
 
 from ...api.app import app
-from ...core.config import settings
+from ...core.config import get_settings
 
 serve_cli = typer.Typer(help="Serve the API")
 
@@ -48,7 +48,9 @@ def start_server(
         port=port,
         workers=workers,
         reload=reload,
-        log_level=settings.logging.level.lower(),
+        loop="uvloop",
+        http="httptools",
+        log_level=get_settings().logging.level.lower(),
         proxy_headers=True,
         forwarded_allow_ips="*"
     )
@@ -11,7 +11,7 @@ from parallama.core.database import (
     get_db as get_core_db,
     get_redis as get_core_redis,
     SessionLocal,
-    redis_client as redis_pool,
+    redis_pool,
 )
 
 
@@ -2,6 +2,7 @@
 
 from typing import List, Dict, Any, Optional
 from rich.console import Console
+from rich.markup import escape
 from rich.table import Table
 
 console = Console()
@@ -36,9 +37,10 @@ def print_key(key: str) -> None:
     Args:
         key: API key to print
     """
-    console.print("\nAPI Key:", style="bold")
-    console.print(key, style="green")
-    console.print("\nStore this key securely - it won't be shown again.\n")
+    console.print(
+        f"\n[bold]API Key:[/bold]\n[green]{escape(key)}[/green]\n"
+        "\nStore this key securely - it won't be shown again.\n"
+    )
 
 def print_table(table: Table) -> None:
     """Print rich table.
@@ -61,14 +63,16 @@ def format_dict(data: Dict[str, Any], key_width: Optional[int] = None) -> str:
     if not data:
         return "None"
     
+    keys = [str(k) for k in data]
+
     # Find max key length if width not specified
     if key_width is None:
-        key_width = max(len(str(k)) for k in data.keys())
+        key_width = max(len(k) for k in keys)
     
     # Format each line
     lines = []
-    for key, value in data.items():
-        key_str = str(key).ljust(key_width)
+    for key, value in zip(keys, data.values()):
+        key_str = key.ljust(key_width)
         if isinstance(value, dict):
             # Handle nested dictionaries
             nested = format_dict(value, key_width)
@@ -33,16 +33,14 @@ def print_table(headers: List[str], rows: List[List[Any]], title: str = None) ->
         return
     
     # Format any datetime objects
-    formatted_rows = []
-    for row in rows:
-        formatted_row = []
-        for cell in row:
-            if isinstance(cell, datetime):
-                formatted_row.append(format_datetime(cell))
-            else:
-                formatted_row.append(str(cell) if cell is not None else "N/A")
-        formatted_rows.append(formatted_row)
-    
+    formatted_rows = [None] * len(rows)
+    for i, row in enumerate(rows):
+        formatted_rows[i] = [
+            format_datetime(cell) if isinstance(cell, datetime)
+            else (str(cell) if cell is not None else "N/A")
+            for cell in row
+        ]
+
     click.echo(tabulate(
         formatted_rows,
         headers=headers,
@@ -50,12 +48,17 @@ def print_table(headers: List[str], rows: List[List[Any]], title: str = None) ->
     ))
 
 def print_key(key: str, description: str = None) -> None:
-    """Print an API key with optional description."""
-    click.secho("\nAPI Key:", fg="blue", bold=True)
-    click.echo(key)
-    if description:
-        click.echo(f"Description: {description}")
-    click.echo("\nStore this key securely - it won't be shown again!")
+    """Print an API key with optional description.
+
+    The block is assembled up front and written with a single echo; click
+    strips the header styling when output is not a terminal.
+    """
+    header = click.style("\nAPI Key:", fg="blue", bold=True)
+    details = f"Description: {description}\n" if description else ""
+    click.echo(
+        f"{header}\n{key}\n{details}"
+        "\nStore this key securely - it won't be shown again!"
+    )
 
 def confirm_action(message: str, abort: bool = True) -> bool:
     """
@@ -83,15 +86,16 @@ def format_dict(data: Dict[str, Any], title: str = None) -> None:
         click.secho("No data available", fg="yellow")
         return
     
-    max_key_length = max(len(str(k)) for k in data.keys())
+    keys = [str(k) for k in data]
+    max_key_length = max(len(k) for k in keys)
     
-    for key, value in data.items():
+    for key, value in zip(keys, data.values()):
         if isinstance(value, datetime):
             value = format_datetime(value)
         elif value is None:
             value = "N/A"
         
         # Create a padded key string with exact width
-        padded_key = f"{str(key):<{max_key_length}}"
+        padded_key = f"{key:<{max_key_length}}"
         key_str = click.style(padded_key, fg="cyan")
         click.echo(f"{key_str}: {value}")
@@ -1,19 +1,28 @@
 """Configuration management."""
 
 import os
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # LibYAML bindings not available
+    from yaml import SafeLoader as _YamlLoader
 
-class LoggingConfig(BaseModel):
+
+@dataclass(frozen=True)
+class LoggingConfig:
     """Logging configuration."""
 
     level: str = "info"
 
-class ServerConfig(BaseModel):
+@dataclass(frozen=True)
+class ServerConfig:
     """Server configuration."""
 
     host: str = "0.0.0.0"
@@ -22,41 +31,57 @@ class ServerConfig(BaseModel):
     log_level: str = "info"
 
 
-class DatabaseConfig(BaseModel):
-    """Database configuration."""
+@dataclass(frozen=True)
+class DatabaseConfig:
+    """Database configuration.
+
+    The pool settings apply to server databases; SQLite URLs keep
+    SQLAlchemy's default pool.
+    """
 
     url: str
+    echo_sql: bool = False
+    pool_size: int = 20
+    max_overflow: int = 10
+    pool_timeout: int = 30
+    pool_recycle: int = 3600
+    pool_pre_ping: bool = True
 
 
-class RedisConfig(BaseModel):
+@dataclass(frozen=True)
+class RedisConfig:
     """Redis configuration."""
 
     url: str
 
 
-class JWTConfig(BaseModel):
+@dataclass(frozen=True)
+class JWTConfig:
     """JWT configuration."""
 
     secret_file: str
     expiry: int = 3600
 
 
-class AuthConfig(BaseModel):
+@dataclass(frozen=True)
+class AuthConfig:
     """Authentication configuration."""
 
     jwt: JWTConfig
-    allowed_users: List[str] = Field(default_factory=list)
-    admin_users: List[str] = Field(default_factory=list)
+    allowed_users: List[str] = field(default_factory=list)
+    admin_users: List[str] = field(default_factory=list)
 
 
-class GatewayConfig(BaseModel):
+@dataclass(frozen=True)
+class GatewayConfig:
     """Gateway configuration."""
 
     url: str
     enabled: bool = True
 
 
-class GatewaysConfig(BaseModel):
+@dataclass(frozen=True)
+class GatewaysConfig:
     """Gateways configuration."""
 
     ollama: Optional[GatewayConfig] = None
@@ -64,7 +89,12 @@ class GatewaysConfig(BaseModel):
 
 
 class Settings(BaseModel):
-    """Application settings."""
+    """Application settings.
+
+    Only the top-level model uses pydantic, to validate the parsed YAML;
+    the nested sections are plain frozen dataclasses that pydantic fills
+    in during validation.
+    """
 
     server: ServerConfig
     database: DatabaseConfig
@@ -86,6 +116,17 @@ def get_settings() -> Settings:
     return _settings
 
 
+@lru_cache(maxsize=8)
+def _load_yaml(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML config file.
+
+    Results are cached by path and modification time, so repeated loads of
+    an unchanged file skip parsing while edits are picked up immediately.
+    """
+    with open(path) as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
 def load_settings(config_path: Path) -> None:
     """Load settings from config file."""
     global _settings
@@ -93,8 +134,7 @@ def load_settings(config_path: Path) -> None:
     if not config_path.exists():
         raise FileNotFoundError(f"Config file not found: {config_path}")
 
-    with open(config_path) as f:
-        config_data = yaml.safe_load(f)
+    config_data = _load_yaml(str(config_path), config_path.stat().st_mtime_ns)
 
     _settings = Settings.model_validate(config_data)
 
@@ -1,7 +1,9 @@
-"""Database configuration."""
+"""Database and Redis connection management."""
 
+import logging
 from contextlib import contextmanager
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 import redis
@@ -14,17 +16,38 @@ Base = declarative_base()
 # Initialize these after settings are loaded
 engine = None
 SessionLocal = None
+redis_pool = None
 redis_client = None
 
 
 def init_db():
     """Initialize database connection."""
-    global engine, SessionLocal, redis_client
+    global engine, SessionLocal, redis_pool, redis_client
     
     if engine is None:
-        engine = create_engine(get_settings().database.url)
+        settings = get_settings()
+        # SQL echo is driven by the logger level rather than create_engine(echo=...)
+        # so the disabled path is a cheap isEnabledFor() check per statement;
+        # otherwise the level is left to the application's logging config
+        if settings.database.echo_sql:
+            logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+        database = settings.database
+        pool_options = {}
+        if make_url(database.url).get_backend_name() != "sqlite":
+            # Size the pool for concurrent requests and drop connections
+            # the server or a proxy may already have closed
+            pool_options = dict(
+                pool_size=database.pool_size,
+                max_overflow=database.max_overflow,
+                pool_timeout=database.pool_timeout,
+                pool_recycle=database.pool_recycle,
+                pool_pre_ping=database.pool_pre_ping
+            )
+        engine = create_engine(database.url, **pool_options)
         SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-        redis_client = redis.from_url(get_settings().redis.url)
+        # All Redis clients share one pool built straight from the configured URL
+        redis_pool = redis.ConnectionPool.from_url(settings.redis.url)
+        redis_client = redis.Redis(connection_pool=redis_pool)
 
 
 def get_db() -> Session:
@@ -1,6 +1,16 @@
 from enum import Enum, auto
+from types import MappingProxyType
 
-class Permission(str, Enum):
+try:
+    from enum import StrEnum as _StrEnum
+except ImportError:  # Python < 3.11
+    class _StrEnum(str, Enum):
+        """Minimal stand-in for enum.StrEnum on older interpreters."""
+
+        def __str__(self) -> str:
+            return self.value
+
+class Permission(_StrEnum):
     """
     Enum defining all available permissions in the system.
     Using string enum for easy serialization and database storage.
@@ -19,16 +29,16 @@ class Permission(str, Enum):
     PREMIUM_RATE_LIMITS = "premium_rate_limits"
     BASIC_RATE_LIMITS = "basic_rate_limits"
 
-    def __str__(self) -> str:
-        return self.value
-
 class DefaultRoles:
     """
     Defines the default roles and their associated permissions.
+
+    Role definitions are read-only mappings shared across the application,
+    and permissions are frozensets so membership checks are constant time.
     """
-    ADMIN = {
+    ADMIN = MappingProxyType({
         "name": "admin",
-        "permissions": [
+        "permissions": frozenset({
             Permission.MANAGE_USERS,
             Permission.MANAGE_ROLES,
             Permission.VIEW_METRICS,
@@ -36,25 +46,25 @@ class DefaultRoles:
             Permission.USE_OPENAI,
             Permission.MANAGE_MODELS,
             Permission.PREMIUM_RATE_LIMITS
-        ]
-    }
+        })
+    })
     
-    PREMIUM = {
+    PREMIUM = MappingProxyType({
         "name": "premium",
-        "permissions": [
+        "permissions": frozenset({
             Permission.USE_OLLAMA,
             Permission.USE_OPENAI,
             Permission.PREMIUM_RATE_LIMITS
-        ]
-    }
+        })
+    })
     
-    BASIC = {
+    BASIC = MappingProxyType({
         "name": "basic",
-        "permissions": [
+        "permissions": frozenset({
             Permission.USE_OLLAMA,
             Permission.BASIC_RATE_LIMITS
-        ]
-    }
+        })
+    })
 
     @classmethod
     def get_all_roles(cls) -> dict:
@@ -1,11 +1,31 @@
 """Database session management and configuration."""
-from typing import Generator
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.engine import Engine
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+logger = logging.getLogger(__name__)
 
 class DatabaseSettings:
-    """Database configuration settings."""
+    """Database configuration settings.
+
+    Connections are rotated via ``pool_recycle``; keep it below the server
+    or proxy idle timeout. ``pool_pre_ping`` stays on until the application
+    startup awaits ``DatabaseSessionManager.ping``, since nothing else
+    detects a dead database before the first request fails. Disable it
+    where the recycle interval alone is enough.
+
+    ``driver`` is the SQLAlchemy async dialect+driver name and defaults to
+    asyncpg; tests can point it at another async driver.
+    """
     def __init__(
         self,
         host: str,
@@ -13,9 +33,12 @@ class DatabaseSettings:
         username: str,
         password: str,
         database: str,
-        pool_size: int = 5,
-        max_overflow: int = 10,
-        pool_timeout: int = 30
+        pool_size: int = 20,
+        max_overflow: int = 40,
+        pool_timeout: int = 30,
+        pool_recycle: int = 300,
+        pool_pre_ping: bool = True,
+        driver: str = "postgresql+asyncpg"
     ):
         self.host = host
         self.port = port
@@ -25,40 +48,123 @@ class DatabaseSettings:
         self.pool_size = pool_size
         self.max_overflow = max_overflow
         self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+        self.pool_pre_ping = pool_pre_ping
+        self.driver = driver
+
+    @classmethod
+    def from_env(cls) -> "DatabaseSettings":
+        """Create database settings from environment variables.
+
+        Returns:
+            DatabaseSettings: Database settings
+
+        Example:
+            - DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME -> connection
+            - DB_POOL_SIZE -> pool_size
+            - DB_MAX_OVERFLOW -> max_overflow
+            - DB_POOL_TIMEOUT -> pool_timeout
+            - DB_POOL_RECYCLE -> pool_recycle
+            - DB_POOL_PRE_PING -> pool_pre_ping ("false" disables it)
+            - DB_DRIVER -> driver
+        """
+        return cls(
+            host=os.getenv("DB_HOST", "localhost"),
+            port=int(os.getenv("DB_PORT", "5432")),
+            username=os.getenv("DB_USER", "parallama"),
+            password=os.getenv("DB_PASSWORD", ""),
+            database=os.getenv("DB_NAME", "parallama"),
+            pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "40")),
+            pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "300")),
+            pool_pre_ping=os.getenv("DB_POOL_PRE_PING", "true").lower() != "false",
+            driver=os.getenv("DB_DRIVER", "postgresql+asyncpg")
+        )
 
     @property
     def database_url(self) -> str:
         """Generate database URL from settings."""
-        return f"postgresql://{self.username}:{self.password}@{self.host}:{self.port}/{self.database}"
+        return f"{self.driver}://{self.username}:{self.password}@{self.host}:{self.port}/{self.database}"
 
-def create_engine_from_settings(settings: DatabaseSettings) -> Engine:
-    """Create SQLAlchemy engine from settings."""
-    return create_engine(
+def create_engine_from_settings(settings: DatabaseSettings) -> AsyncEngine:
+    """Create async SQLAlchemy engine from settings."""
+    logger.info(
+        "Creating database engine: pool_size=%d max_overflow=%d "
+        "pool_timeout=%ds pool_recycle=%ds pool_pre_ping=%s",
+        settings.pool_size,
+        settings.max_overflow,
+        settings.pool_timeout,
+        settings.pool_recycle,
+        settings.pool_pre_ping
+    )
+    return create_async_engine(
         settings.database_url,
         pool_size=settings.pool_size,
         max_overflow=settings.max_overflow,
         pool_timeout=settings.pool_timeout,
-        pool_pre_ping=True  # Enable connection health checks
+        pool_recycle=settings.pool_recycle,
+        pool_pre_ping=settings.pool_pre_ping
     )
 
 class DatabaseSessionManager:
     """Manages database sessions and connections."""
     def __init__(self, settings: DatabaseSettings):
         self.engine = create_engine_from_settings(settings)
-        self.SessionLocal = sessionmaker(
-            autocommit=False,
+        self.SessionLocal = async_sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
             autoflush=False,
-            bind=self.engine
+            expire_on_commit=False
         )
 
-    def get_session(self) -> Generator[Session, None, None]:
-        """Get a database session."""
-        session = self.SessionLocal()
-        try:
+    @asynccontextmanager
+    async def session_scope(self) -> AsyncIterator[AsyncSession]:
+        """Provide a short-lived session around a block of DB work.
+
+        Keep the block limited to the queries themselves so the pooled
+        connection is returned before any slow upstream gateway call.
+
+        Example:
+            async with manager.session_scope() as session:
+                user = await session.get(User, user_id)
+            response = await gateway.handle_request(request)
+        """
+        async with self.SessionLocal() as session:
             yield session
-        finally:
-            session.close()
 
-    def dispose_engine(self) -> None:
+    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
+        """Get a database session for the lifetime of a request.
+
+        FastAPI caches dependencies per request, so every Depends on this
+        within one request receives the same session.
+        """
+        async with self.session_scope() as session:
+            yield session
+
+    async def get_connection(self) -> AsyncGenerator[AsyncConnection, None]:
+        """Get a Core connection for read-only lookups.
+
+        Skips ORM session bookkeeping for queries that only need rows, such
+        as auth lookups. Use get_session for work that writes through the ORM.
+        """
+        async with self.engine.connect() as conn:
+            yield conn
+
+    async def ping(self) -> bool:
+        """Check database connectivity once, e.g. at application startup.
+
+        Returns:
+            bool: True if the database answered, False otherwise
+        """
+        try:
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception:
+            logger.exception("Database ping failed")
+            return False
+        return True
+
+    async def dispose_engine(self) -> None:
         """Dispose of the engine and connection pool."""
-        self.engine.dispose()
+        await self.engine.dispose()
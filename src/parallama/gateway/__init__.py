@@ -1,9 +1,10 @@
 """Gateway module for handling LLM service integrations."""
 
-from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Type
-from fastapi import Request, Response
+import inspect
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Type
 
+from .base import LLMGateway
 from .config import (
     GatewayType,
     RateLimitConfig,
@@ -11,95 +12,72 @@ from .config import (
     OllamaConfig,
     OpenAIConfig
 )
-from .ollama import OllamaGateway
-from .openai import OpenAIGateway
 
-class LLMGateway(ABC):
-    """Base class for LLM service gateways."""
-
-    @abstractmethod
-    async def validate_auth(self, credentials: str) -> bool:
-        """Validate authentication credentials.
-        
-        Args:
-            credentials: The authentication token or API key
-            
-        Returns:
-            bool: True if credentials are valid, False otherwise
-        """
-        pass
+class GatewayRegistry:
+    """Registry for managing gateway implementations.
 
-    @abstractmethod
-    async def transform_request(self, request: Request) -> Dict[str, Any]:
-        """Transform incoming request to LLM service format.
-        
-        Args:
-            request: The incoming FastAPI request
-            
-        Returns:
-            Dict[str, Any]: The transformed request data
-        """
-        pass
+    Both tables are keyed by ``GatewayType``. Because the enum is a ``str``
+    subclass, lookups by the raw type name (e.g. from a URL path) resolve to
+    the same entry.
 
-    @abstractmethod
-    async def transform_response(self, response: Dict[str, Any]) -> Response:
-        """Transform LLM service response to API format.
-        
-        Args:
-            response: The raw response from LLM service
-            
-        Returns:
-            Response: The transformed FastAPI response
-        """
-        pass
+    The tables are only written at startup and shutdown, so request-path
+    reads need no locking and callers only ever get read-only views.
+    """
 
-    @abstractmethod
-    async def get_status(self) -> Dict[str, Any]:
-        """Get gateway status and available models.
-        
-        Returns:
-            Dict[str, Any]: Status information including:
-                - available models
-                - gateway health
-                - version information
-        """
-        pass
+    _instances: Dict[GatewayType, LLMGateway] = {}
+    _gateway_types: Dict[GatewayType, Type[LLMGateway]] = {}
 
-    @abstractmethod
-    async def close(self) -> None:
-        """Close any open connections."""
-        pass
+    # Request-path methods that must be coroutines; a plain def would block
+    # the event loop for every request routed to the gateway
+    _async_methods = (
+        "validate_auth",
+        "transform_request",
+        "transform_response",
+        "get_status"
+    )
 
-    @abstractmethod
-    async def handle_error(self, error: Exception) -> Response:
-        """Handle errors and return appropriate responses.
+    @classmethod
+    def register(cls, gateway_type: GatewayType, gateway_class: Type[LLMGateway]) -> None:
+        """Register a gateway implementation.
         
         Args:
-            error: The exception that occurred
+            gateway_type: The type identifier for this gateway
+            gateway_class: The gateway class implementing this type
             
-        Returns:
-            Response: An error response with appropriate status code
+        Raises:
+            TypeError: If a request-path method is not declared async
         """
-        pass
-
-class GatewayRegistry:
-    """Registry for managing gateway implementations."""
-
-    _instances: Dict[str, LLMGateway] = {}
-    _gateway_types: Dict[str, Type[LLMGateway]] = {}
+        for name in cls._async_methods:
+            if not inspect.iscoroutinefunction(getattr(gateway_class, name, None)):
+                raise TypeError(
+                    f"{gateway_class.__name__}.{name} must be declared with 'async def'"
+                )
+        cls._gateway_types[gateway_type] = gateway_class
 
     @classmethod
-    def register(cls, gateway_type: str, gateway: LLMGateway) -> None:
-        """Register a gateway instance.
+    def initialize_all(cls, configs: Dict[GatewayType, GatewayConfig]) -> None:
+        """Create one long-lived instance per registered gateway type.
+        
+        Called once at application startup so request handling only performs
+        a lookup. Registered types without a configuration are skipped.
         
         Args:
-            gateway_type: The type identifier for this gateway
-            gateway: The gateway instance to register
+            configs: Map of gateway types to their configuration
         """
-        cls._instances[gateway_type] = gateway
+        for gateway_type, gateway_class in cls._gateway_types.items():
+            config = configs.get(gateway_type)
+            if config is not None:
+                cls._instances[gateway_type] = gateway_class(config)
 
     @classmethod
-    def get_gateway(cls, gateway_type: str) -> Optional[LLMGateway]:
+    async def close_all(cls) -> None:
+        """Close all gateway instances and release their connections."""
+        for gateway in cls._instances.values():
+            await gateway.close()
+        cls._instances.clear()
+
+    @classmethod
+    def get_gateway(cls, gateway_type: GatewayType) -> Optional[LLMGateway]:
         """Get a gateway instance by type.
         
         Args:
@@ -108,16 +86,18 @@ class GatewayRegistry:
         Returns:
             Optional[LLMGateway]: The gateway instance if found, None otherwise
         """
+        # Single probe; instances are built up front by initialize_all
         return cls._instances.get(gateway_type)
 
     @classmethod
-    def list_gateways(cls) -> Dict[str, Type[LLMGateway]]:
+    def list_gateways(cls) -> Mapping[GatewayType, Type[LLMGateway]]:
         """List all registered gateway types.
         
         Returns:
-            Dict[str, Type[LLMGateway]]: Map of gateway types to their implementations
+            Mapping[GatewayType, Type[LLMGateway]]: Read-only map of gateway
+            types to their implementations
         """
-        return cls._gateway_types
+        return MappingProxyType(cls._gateway_types)
 
     @classmethod
     def clear(cls) -> None:
@@ -125,6 +105,20 @@ class GatewayRegistry:
         cls._instances.clear()
         cls._gateway_types.clear()
 
+def __getattr__(name: str):
+    """Import gateway implementations on first access.
+
+    The implementations pull in httpx and the tokenizer, which most importers
+    of this package (config, registry, router) do not need.
+    """
+    if name == "OllamaGateway":
+        from .ollama import OllamaGateway
+        return OllamaGateway
+    if name == "OpenAIGateway":
+        from .openai import OpenAIGateway
+        return OpenAIGateway
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = [
     'GatewayType',
     'LLMGateway',
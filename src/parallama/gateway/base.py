@@ -1,3 +1,5 @@
+"""Base interface for LLM gateway implementations."""
+
 from abc import ABC, abstractmethod
 from typing import Dict, Any
 from fastapi import Request, Response
@@ -9,6 +11,12 @@ class LLMGateway(ABC):
     must follow. Each gateway type (Ollama, OpenAI, etc.) will implement
     these methods according to their specific requirements.
     """
+
+    __slots__ = ()
+
+    # True when upstream stream lines can be relayed to the client
+    # unchanged, letting the router skip decoding and re-encoding them
+    passthrough_stream: bool = False
     
     @abstractmethod
     async def validate_auth(self, credentials: str) -> bool:
@@ -58,3 +66,20 @@ class LLMGateway(ABC):
                 - additional gateway-specific metadata
         """
         pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Close any open connections."""
+        pass
+
+    @abstractmethod
+    async def handle_error(self, error: Exception) -> Response:
+        """Handle errors and return appropriate responses.
+        
+        Args:
+            error: The exception that occurred
+            
+        Returns:
+            Response: An error response with appropriate status code
+        """
+        pass
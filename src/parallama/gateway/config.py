@@ -1,28 +1,60 @@
 """Gateway configuration handling."""
 
 from dataclasses import dataclass, field
-from typing import Dict, Optional, List, Union
+from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional
+from urllib.parse import urlsplit, urlunsplit
 import os
 
-@dataclass
+import orjson
+
+# Default OpenAI -> Ollama model names; read-only so instances cannot alter it
+_OPENAI_MODEL_MAPPINGS: Mapping[str, str] = MappingProxyType({
+    "gpt-3.5-turbo": "llama2",
+    "gpt-4": "llama2:70b"
+})
+
+class GatewayType(str, Enum):
+    """Supported gateway types."""
+
+    OLLAMA = "ollama"
+    OPENAI = "openai"
+
+@dataclass(frozen=True)
 class EndpointConfig:
-    """Configuration for API endpoints."""
+    """Configuration for enabled OpenAI-compatible endpoints."""
 
-    url: str
-    method: str = "POST"
-    headers: Optional[Dict[str, str]] = None
-    params: Optional[Dict[str, str]] = None
+    chat: bool = True
+    completions: bool = True
+    embeddings: bool = True
+    edits: bool = True
+    moderations: bool = True
 
-@dataclass
+@dataclass(frozen=True)
 class RateLimitConfig:
     """Configuration for rate limiting."""
 
     requests_per_minute: int = 60
+    requests_per_hour: int = 3600
     tokens_per_minute: int = 10000
-    requests_per_day: int = 1000
-    tokens_per_day: int = 100000
+    tokens_per_hour: int = 600000
+
+    def __post_init__(self) -> None:
+        """Validate limits and the minute/hour relationship."""
+        for name in (
+            "requests_per_minute",
+            "requests_per_hour",
+            "tokens_per_minute",
+            "tokens_per_hour"
+        ):
+            if getattr(self, name) < 1:
+                raise ValueError(f"{name} must be >= 1")
+        if self.requests_per_hour < self.requests_per_minute * 60:
+            raise ValueError("Hourly rate must be >= per-minute rate * 60")
 
-@dataclass
+@dataclass(frozen=True)
 class TokenCounterConfig:
     """Configuration for token counting."""
 
@@ -34,182 +66,227 @@ class TokenCounterConfig:
     count_method: str = "simple"
     token_multiplier: float = 1.0
 
-@dataclass
+@dataclass(frozen=True)
+class PerformanceConfig:
+    """Configuration for upstream connection handling."""
+
+    connection_pool_size: int = 100
+    request_timeout: int = 30
+    max_retries: int = 3
+    batch_size: int = 10
+
+def _env_settings(prefix: str, default_url: str = "") -> Dict[str, Any]:
+    """Read the connection settings shared by all gateway types.
+
+    Args:
+        prefix: Environment variable prefix, e.g. "OLLAMA_"
+        default_url: Base URL used when {prefix}BASE_URL is unset
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for a gateway configuration
+
+    Raises:
+        ValueError: If {prefix}HEADERS is not valid JSON
+    """
+    settings: Dict[str, Any] = {
+        "timeout": int(os.getenv(f"{prefix}TIMEOUT", "30")),
+        "max_retries": int(os.getenv(f"{prefix}MAX_RETRIES", "3"))
+    }
+
+    base_url = os.getenv(f"{prefix}BASE_URL", default_url)
+    if base_url:
+        # The whole base URL is kept as the host, so path prefixes and
+        # bracketed IPv6 addresses survive; any port stays in the netloc
+        url = urlsplit(base_url)
+        settings["host"] = urlunsplit(url._replace(query="", fragment=""))
+        settings["port"] = None
+
+    # Get optional headers
+    headers_str = os.getenv(f"{prefix}HEADERS", "")
+    if headers_str:
+        try:
+            settings["headers"] = orjson.loads(headers_str)
+        except orjson.JSONDecodeError as e:
+            raise ValueError(f"Invalid headers JSON: {str(e)}")
+
+    return settings
+
+@dataclass(frozen=True)
 class GatewayConfig:
     """Base configuration for gateways."""
 
-    gateway_type: str
-    base_url: str
+    name: str
+    type: Optional[GatewayType] = None
+    base_path: str = ""
+    enabled: bool = True
+    host: Optional[str] = None
+    port: Optional[int] = None
     timeout: int = 30
     max_retries: int = 3
     headers: Optional[Dict[str, str]] = None
+    model_mappings: Dict[str, str] = field(default_factory=dict)
+    rate_limits: RateLimitConfig = field(default_factory=RateLimitConfig)
+    custom_config: Dict[str, Any] = field(default_factory=dict)
+    _endpoint_url: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _map_get: Optional[Callable[[str, str], str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        """Normalize base_path, validate settings and precompute lookups."""
+        # Already-normalized paths, the common case, are left untouched
+        base_path = self.base_path
+        if not base_path.startswith("/") or base_path.endswith("/"):
+            base_path = "/" + (base_path or self.name).lstrip("/")
+            object.__setattr__(self, "base_path", base_path.rstrip("/"))
+
+        if self.timeout <= 0:
+            raise ValueError("timeout must be > 0")
+        if self.max_retries < 0:
+            raise ValueError("max_retries must be >= 0")
+
+        object.__setattr__(self, "_map_get", self.model_mappings.get)
+
+        # Configs are frozen, so the endpoint URL only needs building once
+        if self.host:
+            url = self.host.rstrip("/")
+            if self.port:
+                url = f"{url}:{self.port}"
+            object.__setattr__(self, "_endpoint_url", f"{url}{self.base_path}")
+
+    def get_endpoint_url(self) -> str:
+        """Get the full URL the gateway is served under.
+
+        Returns:
+            str: Host, optional port and base path
+
+        Raises:
+            ValueError: If no host is configured
+        """
+        if self._endpoint_url is None:
+            raise ValueError(f"Gateway '{self.name}' has no host configured")
+        return self._endpoint_url
+
+    def get_model_mapping(self, model: str) -> str:
+        """Map an external model name to the backend model.
+
+        Args:
+            model: Model name from the incoming request
+
+        Returns:
+            str: Mapped model name, or the input if there is no mapping
+        """
+        return self._map_get(model, model)
 
     @classmethod
     def from_env(cls, gateway_type: str, prefix: str = "") -> "GatewayConfig":
         """Create configuration from environment variables.
-        
+
+        The environment is read once per (gateway_type, prefix); later calls
+        return the cached configuration.
+
         Args:
             gateway_type: Gateway type identifier
             prefix: Optional prefix for environment variables
-            
+
         Returns:
             GatewayConfig: Gateway configuration
-            
+
         Example:
             For prefix="OLLAMA_":
-            - OLLAMA_BASE_URL -> base_url
+            - OLLAMA_BASE_URL -> host
             - OLLAMA_TIMEOUT -> timeout
             - OLLAMA_MAX_RETRIES -> max_retries
             - OLLAMA_HEADERS -> headers (as JSON string)
         """
+        return cls._from_env_cached(gateway_type, prefix)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _from_env_cached(cls, gateway_type: str, prefix: str) -> "GatewayConfig":
+        """Build and memoize the configuration for from_env."""
         # Build full prefix
         if prefix and not prefix.endswith("_"):
             prefix = f"{prefix}_"
 
-        # Get base URL
-        base_url = os.getenv(f"{prefix}BASE_URL", "")
-        if not base_url:
+        settings = _env_settings(prefix)
+        if "host" not in settings:
             raise ValueError(f"Missing required environment variable: {prefix}BASE_URL")
 
-        # Get optional settings
-        timeout = int(os.getenv(f"{prefix}TIMEOUT", "30"))
-        max_retries = int(os.getenv(f"{prefix}MAX_RETRIES", "3"))
-
-        # Get optional headers
-        headers_str = os.getenv(f"{prefix}HEADERS", "")
-        headers = None
-        if headers_str:
-            try:
-                import json
-                headers = json.loads(headers_str)
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid headers JSON: {str(e)}")
-
         return cls(
-            gateway_type=gateway_type,
-            base_url=base_url,
-            timeout=timeout,
-            max_retries=max_retries,
-            headers=headers
+            name=gateway_type,
+            type=GatewayType(gateway_type),
+            **settings
         )
 
-@dataclass
+@dataclass(frozen=True)
 class OllamaConfig(GatewayConfig):
     """Configuration for Ollama gateway."""
 
-    def __init__(
-        self,
-        base_url: str = "http://localhost:11434",
-        timeout: int = 30,
-        max_retries: int = 3,
-        headers: Optional[Dict[str, str]] = None
-    ):
-        """Initialize Ollama configuration.
-        
-        Args:
-            base_url: Ollama API base URL
-            timeout: Request timeout in seconds
-            max_retries: Maximum number of retries
-            headers: Optional request headers
-        """
-        super().__init__(
-            gateway_type="ollama",
-            base_url=base_url,
-            timeout=timeout,
-            max_retries=max_retries,
-            headers=headers
-        )
+    name: str = "ollama"
+    type: Optional[GatewayType] = GatewayType.OLLAMA
+    base_path: str = "/ollama/v1"
+    host: Optional[str] = "http://localhost"
+    port: Optional[int] = 11434
 
     @classmethod
     def from_env(cls) -> "OllamaConfig":
         """Create Ollama configuration from environment variables."""
-        # Get base URL
-        base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-        timeout = int(os.getenv("OLLAMA_TIMEOUT", "30"))
-        max_retries = int(os.getenv("OLLAMA_MAX_RETRIES", "3"))
-
-        # Get optional headers
-        headers_str = os.getenv("OLLAMA_HEADERS", "")
-        headers = None
-        if headers_str:
-            try:
-                import json
-                headers = json.loads(headers_str)
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid headers JSON: {str(e)}")
+        return cls._from_env_cached()
 
-        return cls(
-            base_url=base_url,
-            timeout=timeout,
-            max_retries=max_retries,
-            headers=headers
-        )
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _from_env_cached(cls) -> "OllamaConfig":
+        """Build and memoize the configuration for from_env."""
+        return cls(**_env_settings("OLLAMA_", "http://localhost:11434"))
 
+@dataclass(frozen=True)
 class OpenAIConfig(GatewayConfig):
     """Configuration for OpenAI compatibility gateway."""
 
-    def __init__(
-        self,
-        api_key: str,
-        base_url: str = "https://api.openai.com/v1/",
-        timeout: int = 30,
-        max_retries: int = 3,
-        headers: Optional[Dict[str, str]] = None
-    ):
-        """Initialize OpenAI configuration.
-        
-        Args:
-            api_key: OpenAI API key
-            base_url: OpenAI API base URL
-            timeout: Request timeout in seconds
-            max_retries: Maximum number of retries
-            headers: Optional request headers
-        """
-        super().__init__(
-            gateway_type="openai",
-            base_url=base_url,
-            timeout=timeout,
-            max_retries=max_retries,
-            headers=headers
-        )
-        self.api_key = api_key
+    name: str = "openai"
+    type: Optional[GatewayType] = GatewayType.OPENAI
+    base_path: str = "/openai/v1"
+    model_mappings: Dict[str, str] = field(
+        default_factory=lambda: dict(_OPENAI_MODEL_MAPPINGS)
+    )
+    compatibility_mode: bool = True
+    api_key: Optional[str] = None
+    token_counter: TokenCounterConfig = field(default_factory=TokenCounterConfig)
+    performance: PerformanceConfig = field(default_factory=PerformanceConfig)
+    endpoints: EndpointConfig = field(default_factory=EndpointConfig)
 
     @classmethod
     def from_env(cls) -> "OpenAIConfig":
-        """Create OpenAI configuration from environment variables."""
-        # Get API key first
-        api_key = os.getenv("OPENAI_API_KEY", "")
-        if not api_key:
-            raise ValueError("Missing required environment variable: OPENAI_API_KEY")
-
-        # Get base URL and other settings
-        base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1/")
-        timeout = int(os.getenv("OPENAI_TIMEOUT", "30"))
-        max_retries = int(os.getenv("OPENAI_MAX_RETRIES", "3"))
-
-        # Get optional headers
-        headers_str = os.getenv("OPENAI_HEADERS", "")
-        headers = None
-        if headers_str:
-            try:
-                import json
-                headers = json.loads(headers_str)
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid headers JSON: {str(e)}")
+        """Create OpenAI configuration from environment variables.
 
-        return cls(
-            api_key=api_key,
-            base_url=base_url,
-            timeout=timeout,
-            max_retries=max_retries,
-            headers=headers
-        )
+        Raises:
+            ValueError: If neither OPENAI_BASE_URL nor OPENAI_API_KEY is set,
+                i.e. the OpenAI gateway is not configured
+        """
+        return cls._from_env_cached()
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _from_env_cached(cls) -> "OpenAIConfig":
+        """Build and memoize the configuration for from_env."""
+        api_key = os.getenv("OPENAI_API_KEY") or None
+        settings = _env_settings("OPENAI_")
+        if api_key is None and "host" not in settings:
+            raise ValueError(
+                "Missing required environment variable: OPENAI_BASE_URL or OPENAI_API_KEY"
+            )
+        return cls(api_key=api_key, **settings)
 
 __all__ = [
+    "GatewayType",
     "GatewayConfig",
     "OllamaConfig",
     "OpenAIConfig",
     "TokenCounterConfig",
+    "PerformanceConfig",
     "EndpointConfig",
     "RateLimitConfig"
 ]
@@ -1,14 +1,26 @@
 """OpenAI-compatible edits endpoint implementation."""
 
 from typing import Dict, Any, List
-from fastapi import Request
-from fastapi.responses import JSONResponse
+from fastapi import Request, Response
 
 from ..config import OpenAIConfig
+from ..schemas import CompletionUsage, EditChoice, EditResponse, EditsRequest
+from ..utils import json_response, read_json
+from .token_cache import TokenCountCache
 
 class EditsHandler:
     """Handler for edits endpoint."""
 
+    _PROMPT_TEMPLATE = (
+        "Below is some text that needs to be edited according to an instruction.\n"
+        "\n"
+        "Text: {input_text}\n"
+        "\n"
+        "Instruction: {instruction}\n"
+        "\n"
+        "Edited text:"
+    )
+
     def __init__(self, config: OpenAIConfig):
         """Initialize edits handler.
         
@@ -16,26 +28,27 @@ class EditsHandler:
             config: Gateway configuration
         """
         self.config = config
+        self._token_counts = TokenCountCache()
 
-    async def handle_request(self, request: Request) -> JSONResponse:
+    async def handle_request(self, request: Request) -> Response:
         """Handle edits request.
         
         Args:
             request: The incoming FastAPI request
             
         Returns:
-            JSONResponse: The edits response
+            Response: The edits response
         """
         if not self.config.endpoints.edits:
-            return JSONResponse(
+            return json_response(
                 status_code=404,
                 content={"error": "Edits endpoint is not enabled"}
             )
 
-        data = await request.json()
+        data = await read_json(request)
         validation_error = await self.validate_request(data)
         if validation_error:
-            return JSONResponse(
+            return json_response(
                 status_code=400,
                 content=validation_error
             )
@@ -49,24 +62,17 @@ class EditsHandler:
         # Count input tokens if enabled
         input_tokens = 0
         if self.config.token_counter.enabled:
-            try:
-                tokens = await request.app.state.token_counter.count_tokens(
-                    input_text + instruction,
-                    model
-                )
-                # Handle mock token counter in tests
-                input_tokens = int(tokens) if isinstance(tokens, (int, float)) else 0
-            except (TypeError, ValueError):
-                # Handle any token counting errors
-                input_tokens = 0
-
-        # Transform request for Ollama
-        prompt = self._format_edit_prompt(input_text, instruction)
-        
-        # In production, this would call the actual model
-        # For now, we'll generate a simple edit
+            input_tokens = await self._token_counts.count(
+                request.app.state.token_counter,
+                input_text + instruction,
+                model
+            )
+
+        # In production, this would call the actual model with the prompt
+        # from _format_edit_prompt; for now, we'll generate a simple edit
         edited_texts = await self._generate_edits(
-            prompt,
+            input_text,
+            instruction,
             n,
             temperature
         )
@@ -74,36 +80,26 @@ class EditsHandler:
         # Count output tokens if enabled
         completion_tokens = 0
         if self.config.token_counter.enabled:
-            for text in edited_texts:
-                try:
-                    tokens = await request.app.state.token_counter.count_tokens(
-                        text,
-                        model
-                    )
-                    # Handle mock token counter in tests
-                    completion_tokens += int(tokens) if isinstance(tokens, (int, float)) else 0
-                except (TypeError, ValueError):
-                    # Handle any token counting errors
-                    continue
-
-        response = {
-            "object": "edit",
-            "created": int(request.state.start_time),
-            "choices": [
-                {
-                    "text": text,
-                    "index": i
-                }
+            completion_tokens = await self._token_counts.count_total(
+                request.app.state.token_counter,
+                edited_texts,
+                model
+            )
+
+        response = EditResponse.model_construct(
+            created=int(request.state.start_time),
+            choices=[
+                EditChoice.model_construct(text=text, index=i)
                 for i, text in enumerate(edited_texts)
             ],
-            "usage": {
-                "prompt_tokens": input_tokens,
-                "completion_tokens": completion_tokens,
-                "total_tokens": input_tokens + completion_tokens
-            }
-        }
+            usage=CompletionUsage.model_construct(
+                prompt_tokens=input_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=input_tokens + completion_tokens
+            )
+        )
 
-        return JSONResponse(content=response)
+        return response.to_response()
 
     def _format_edit_prompt(self, input_text: str, instruction: str) -> str:
         """Format the edit prompt for the model.
@@ -115,17 +111,15 @@ class EditsHandler:
         Returns:
             str: Formatted prompt
         """
-        return f"""Below is some text that needs to be edited according to an instruction.
-
-Text: {input_text}
-
-Instruction: {instruction}
-
-Edited text:"""
+        return self._PROMPT_TEMPLATE.format(
+            input_text=input_text,
+            instruction=instruction
+        )
 
     async def _generate_edits(
         self,
-        prompt: str,
+        input_text: str,
+        instruction: str,
         n: int,
         temperature: float
     ) -> List[str]:
@@ -135,7 +129,8 @@ Edited text:"""
         For now, we'll generate simple edits for demonstration.
         
         Args:
-            prompt: The formatted prompt
+            input_text: The input text to edit
+            instruction: The editing instruction
             n: Number of edits to generate
             temperature: Sampling temperature
             
@@ -144,17 +139,18 @@ Edited text:"""
         """
         # For demonstration, we'll make some simple edits
         # In production, this would call the actual model
-        input_text = prompt.split("Text: ")[1].split("\n\nInstruction:")[0].strip()
-        instruction = prompt.split("Instruction: ")[1].split("\n\nEdited text:")[0].strip()
+        input_text = input_text.strip()
+        instruction = instruction.strip()
+        instr_lower = instruction.lower()
         
         edits = []
         for i in range(n):
-            if "fix spelling" in instruction.lower():
+            if "fix spelling" in instr_lower:
                 # Simple spell check simulation
                 edited = input_text.replace("teh", "the").replace("recieve", "receive")
-            elif "uppercase" in instruction.lower():
+            elif "uppercase" in instr_lower:
                 edited = input_text.upper()
-            elif "lowercase" in instruction.lower():
+            elif "lowercase" in instr_lower:
                 edited = input_text.lower()
             else:
                 # Default: append instruction as comment
@@ -177,23 +173,4 @@ Edited text:"""
         Returns:
             Dict[str, str]: Error message if validation fails, empty dict if successful
         """
-        if "instruction" not in data:
-            return {"error": "instruction is required"}
-        
-        if not isinstance(data.get("instruction"), str):
-            return {"error": "instruction must be a string"}
-        
-        if "input" in data and not isinstance(data["input"], str):
-            return {"error": "input must be a string"}
-        
-        if "n" in data:
-            n = data["n"]
-            if not isinstance(n, int) or n < 1 or n > 20:
-                return {"error": "n must be an integer between 1 and 20"}
-        
-        if "temperature" in data:
-            temp = data["temperature"]
-            if not isinstance(temp, (int, float)) or temp < 0 or temp > 2:
-                return {"error": "temperature must be a number between 0 and 2"}
-        
-        return {}
+        return EditsRequest.validate_data(data)
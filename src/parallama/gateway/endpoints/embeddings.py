@@ -1,11 +1,20 @@
 """OpenAI-compatible embeddings endpoint implementation."""
 
+import asyncio
+import hashlib
 from typing import Dict, Any, List
 import numpy as np
-from fastapi import Request
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
 
 from ..config import OpenAIConfig
+from ..schemas import EmbeddingsRequest
+from ..utils import json_response, read_json
+from .token_cache import TokenCountCache
+
+# Responses with more floats than this (~5 MB of JSON) are streamed
+_STREAM_THRESHOLD = 2**18
 
 class EmbeddingsHandler:
     """Handler for embeddings endpoint."""
@@ -21,23 +30,34 @@ class EmbeddingsHandler:
             "text-embedding-ada-002": 1536,  # OpenAI's default embedding model
             "llama2": 4096,  # Llama 2's embedding dimension
         }
+        self._token_counts = TokenCountCache()
 
-    async def handle_request(self, request: Request) -> JSONResponse:
+    async def handle_request(self, request: Request) -> Response:
         """Handle embeddings request.
         
+        Large responses are streamed one embedding at a time; the body is
+        the same JSON document either way.
+        
         Args:
             request: The incoming FastAPI request
             
         Returns:
-            JSONResponse: The embeddings response
+            Response: The embeddings response
         """
         if not self.config.endpoints.embeddings:
-            return JSONResponse(
+            return json_response(
                 status_code=404,
                 content={"error": "Embeddings endpoint is not enabled"}
             )
 
-        data = await request.json()
+        data = await read_json(request)
+        validation_error = await self.validate_request(data)
+        if validation_error:
+            return json_response(
+                status_code=400,
+                content=validation_error
+            )
+
         model = data.get("model", "text-embedding-ada-002")
         input_texts = data.get("input", [])
         
@@ -48,32 +68,43 @@ class EmbeddingsHandler:
         # Use original model name for dimension lookup, not mapped name
         dimension = self.model_dimensions.get(model, 1536)  # Default to OpenAI's dimension if unknown
 
-        # Generate embeddings
-        embeddings = []
+        # Generate pseudo-random embeddings (for demonstration)
+        # In production, this would call the actual model.
+        # Generation runs in a worker thread (numpy releases the GIL while
+        # filling rows) so it overlaps with token counting
+        generation = asyncio.to_thread(
+            self._generate_pseudo_embeddings,
+            input_texts,
+            dimension
+        )
+
+        # Count tokens if enabled
         total_tokens = 0
-        
-        for text in input_texts:
-            # Count tokens if enabled
-            if self.config.token_counter.enabled:
-                try:
-                    tokens = await request.app.state.token_counter.count_tokens(
-                        text,
-                        model
-                    )
-                    # Handle mock token counter in tests
-                    total_tokens += int(tokens) if isinstance(tokens, (int, float)) else 0
-                except (TypeError, ValueError):
-                    # Handle any token counting errors
-                    total_tokens += 0
-            
-            # Generate pseudo-random embedding (for demonstration)
-            # In production, this would call the actual model
-            embedding = self._generate_pseudo_embedding(text, dimension)
-            embeddings.append({
+        if self.config.token_counter.enabled:
+            vectors, total_tokens = await asyncio.gather(
+                generation,
+                self._token_counts.count_total(
+                    request.app.state.token_counter,
+                    input_texts,
+                    model
+                )
+            )
+        else:
+            vectors = await generation
+
+        if vectors.size > _STREAM_THRESHOLD:
+            return self._stream_response(vectors, model, total_tokens)
+
+        # Rows are views into one buffer; json_response serializes them
+        # directly without converting to Python floats
+        embeddings = [
+            {
                 "object": "embedding",
-                "embedding": embedding.tolist(),
-                "index": len(embeddings)
-            })
+                "embedding": vector,
+                "index": index
+            }
+            for index, vector in enumerate(vectors)
+        ]
 
         response = {
             "object": "list",
@@ -85,31 +116,72 @@ class EmbeddingsHandler:
             }
         }
 
-        return JSONResponse(content=response)
+        return json_response(content=response)
 
-    def _generate_pseudo_embedding(self, text: str, dimension: int) -> np.ndarray:
-        """Generate a pseudo-random embedding for demonstration.
+    def _stream_response(
+        self,
+        vectors: np.ndarray,
+        model: str,
+        total_tokens: int
+    ) -> StreamingResponse:
+        """Stream an embeddings response one embedding at a time.
+        
+        Only one serialized row is held in memory at once instead of the
+        whole encoded body.
+        
+        Args:
+            vectors: (N, dimension) matrix of embeddings
+            model: Model name to report
+            total_tokens: Prompt token count to report
+            
+        Returns:
+            StreamingResponse: JSON body identical to the buffered response
+        """
+        async def body():
+            yield b'{"object":"list","data":['
+            for index, vector in enumerate(vectors):
+                item = orjson.dumps(
+                    {"object": "embedding", "embedding": vector, "index": index},
+                    option=orjson.OPT_SERIALIZE_NUMPY
+                )
+                yield item if index == 0 else b"," + item
+            # Reuse the encoded trailer object without its opening brace
+            yield b"]," + orjson.dumps({
+                "model": model,
+                "usage": {
+                    "prompt_tokens": total_tokens,
+                    "total_tokens": total_tokens
+                }
+            })[1:]
+
+        return StreamingResponse(body(), media_type="application/json")
+
+    def _generate_pseudo_embeddings(self, texts: List[str], dimension: int) -> np.ndarray:
+        """Generate pseudo-random embeddings for demonstration.
         
         In production, this would be replaced with actual model calls.
         
         Args:
-            text: Input text
+            texts: Input texts
             dimension: Embedding dimension
             
         Returns:
-            np.ndarray: Normalized embedding vector
+            np.ndarray: (len(texts), dimension) matrix of normalized vectors
         """
-        # Use text hash as random seed for reproducibility
-        seed = hash(text) % (2**32)
-        rng = np.random.RandomState(seed)
-        
-        # Generate random vector
-        embedding = rng.randn(dimension)
+        embeddings = np.empty((len(texts), dimension), dtype=np.float32)
+        for row, text in zip(embeddings, texts):
+            # Seed from a stable digest of the text; the builtin hash() is
+            # salted per process, so workers would disagree on a vector
+            seed = int.from_bytes(
+                hashlib.blake2b(text.encode("utf-8"), digest_size=4).digest(),
+                "little"
+            )
+            np.random.default_rng(seed).standard_normal(dtype=np.float32, out=row)
         
-        # Normalize to unit length (cosine similarity ready)
-        embedding = embedding / np.linalg.norm(embedding)
+        # Normalize every row to unit length (cosine similarity ready)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
         
-        return embedding
+        return embeddings
 
     async def validate_request(self, data: Dict[str, Any]) -> Dict[str, str]:
         """Validate embeddings request.
@@ -120,20 +192,4 @@ class EmbeddingsHandler:
         Returns:
             Dict[str, str]: Error message if validation fails, empty dict if successful
         """
-        if "input" not in data:
-            return {"error": "input is required"}
-        
-        input_texts = data.get("input", [])
-        if isinstance(input_texts, str):
-            input_texts = [input_texts]
-        
-        if not input_texts:
-            return {"error": "input must not be empty"}
-        
-        if not all(isinstance(text, str) for text in input_texts):
-            return {"error": "all input items must be strings"}
-        
-        if len(input_texts) > 100:  # OpenAI's limit
-            return {"error": "maximum of 100 items allowed for embeddings"}
-        
-        return {}
+        return EmbeddingsRequest.validate_data(data)
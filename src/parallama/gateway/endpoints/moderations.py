@@ -1,11 +1,34 @@
 """OpenAI-compatible moderations endpoint implementation."""
 
+from itertools import islice
 from typing import Dict, Any, List, Union
-from fastapi import Request
-from fastapi.responses import JSONResponse
+import math
+import numpy as np
+from fastapi import Request, Response
 import re
 
 from ..config import OpenAIConfig
+from ..schemas import ModerationResponse, ModerationResult, ModerationsRequest, Usage
+from ..utils import json_response, read_json
+from .token_cache import TokenCountCache
+
+# Each match adds this much to a category score, capped at 1.0
+_SCORE_PER_MATCH = 0.3
+# Matches beyond this cannot change a score or flag, so scanning stops
+_MATCH_CAP = math.ceil(1.0 / _SCORE_PER_MATCH)
+
+def _count_capped(pattern: "re.Pattern[str]", text: str, cap: int = _MATCH_CAP) -> int:
+    """Count pattern matches in text, stopping once cap is reached.
+    
+    Args:
+        pattern: Compiled category pattern
+        text: Text to scan
+        cap: Maximum number of matches to count
+        
+    Returns:
+        int: Number of matches, at most cap
+    """
+    return sum(1 for _ in islice(pattern.finditer(text), cap))
 
 class ModerationsHandler:
     """Handler for moderations endpoint."""
@@ -31,26 +54,37 @@ class ModerationsHandler:
         self.score_thresholds = {
             category: 0.5 for category in self.patterns
         }
-
-    async def handle_request(self, request: Request) -> JSONResponse:
+        # Compile once; IGNORECASE avoids lowercasing every input text
+        self._compiled = {
+            category: re.compile(pattern, re.IGNORECASE)
+            for category, pattern in self.patterns.items()
+        }
+        # Category order and thresholds as a vector for one-shot comparison
+        self._categories = tuple(self.patterns)
+        self._thresholds = np.array(
+            [self.score_thresholds[category] for category in self._categories]
+        )
+        self._token_counts = TokenCountCache()
+
+    async def handle_request(self, request: Request) -> Response:
         """Handle moderations request.
         
         Args:
             request: The incoming FastAPI request
             
         Returns:
-            JSONResponse: The moderations response
+            Response: The moderations response
         """
         if not self.config.endpoints.moderations:
-            return JSONResponse(
+            return json_response(
                 status_code=404,
                 content={"error": "Moderations endpoint is not enabled"}
             )
 
-        data = await request.json()
+        data = await read_json(request)
         validation_error = await self.validate_request(data)
         if validation_error:
-            return JSONResponse(
+            return json_response(
                 status_code=400,
                 content=validation_error
             )
@@ -62,37 +96,25 @@ class ModerationsHandler:
         # Count tokens if enabled
         total_tokens = 0
         if self.config.token_counter.enabled:
-            for text in input_texts:
-                try:
-                    tokens = await request.app.state.token_counter.count_tokens(
-                        text,
-                        "text-moderation-latest"
-                    )
-                    # Handle mock token counter in tests
-                    total_tokens += int(tokens) if isinstance(tokens, (int, float)) else 0
-                except (TypeError, ValueError):
-                    # Handle any token counting errors
-                    continue
-
-        # Process each input text
-        results = []
-        for text in input_texts:
-            result = self._analyze_text(text)
-            results.append(result)
-
-        response = {
-            "id": "modr-" + str(request.state.start_time),
-            "model": "text-moderation-latest",
-            "results": results,
-            "usage": {
-                "prompt_tokens": total_tokens,
-                "total_tokens": total_tokens
-            }
-        }
+            total_tokens = await self._token_counts.count_total(
+                request.app.state.token_counter,
+                input_texts,
+                "text-moderation-latest"
+            )
+
+        response = ModerationResponse.model_construct(
+            id="modr-" + str(request.state.start_time),
+            model="text-moderation-latest",
+            results=[self._analyze_text(text) for text in input_texts],
+            usage=Usage.model_construct(
+                prompt_tokens=total_tokens,
+                total_tokens=total_tokens
+            )
+        )
 
-        return JSONResponse(content=response)
+        return response.to_response()
 
-    def _analyze_text(self, text: str) -> Dict[str, Any]:
+    def _analyze_text(self, text: str) -> ModerationResult:
         """Analyze text for content moderation.
         
         In production, this would use more sophisticated models.
@@ -102,31 +124,22 @@ class ModerationsHandler:
             text: Text to analyze
             
         Returns:
-            Dict[str, Any]: Analysis results
+            ModerationResult: Analysis results
         """
-        # Initialize scores and flags
-        category_scores = {}
-        flagged = False
-        
-        # Check each category
-        for category, pattern in self.patterns.items():
-            # Count matches and normalize score
-            matches = len(re.findall(pattern, text.lower()))
-            score = min(1.0, matches * 0.3)  # Simple scoring
-            category_scores[category] = score
-            
-            # Update flagged status
-            if score > self.score_thresholds[category]:
-                flagged = True
-
-        return {
-            "flagged": flagged,
-            "categories": {
-                category: score > self.score_thresholds[category]
-                for category, score in category_scores.items()
-            },
-            "category_scores": category_scores
-        }
+        # Count matches per category and normalize to scores
+        counts = np.fromiter(
+            (_count_capped(self._compiled[category], text) for category in self._categories),
+            dtype=np.float64,
+            count=len(self._categories)
+        )
+        scores = np.minimum(1.0, counts * _SCORE_PER_MATCH)  # Simple scoring
+        flags = scores > self._thresholds
+
+        return ModerationResult.model_construct(
+            flagged=bool(flags.any()),
+            categories=dict(zip(self._categories, flags.tolist())),
+            category_scores=dict(zip(self._categories, scores.tolist()))
+        )
 
     async def validate_request(self, data: Dict[str, Any]) -> Dict[str, str]:
         """Validate moderations request.
@@ -137,25 +150,7 @@ class ModerationsHandler:
         Returns:
             Dict[str, str]: Error message if validation fails, empty dict if successful
         """
-        if "input" not in data:
-            return {"error": "input is required"}
-
-        input_data = data["input"]
-        if not isinstance(input_data, (str, list)):
-            return {"error": "input must be a string or array of strings"}
-
-        if isinstance(input_data, list):
-            if not input_data:
-                return {"error": "input array must not be empty"}
-            if not all(isinstance(item, str) for item in input_data):
-                return {"error": "all input items must be strings"}
-            if len(input_data) > 100:  # OpenAI's limit
-                return {"error": "maximum of 100 items allowed for moderation"}
-
-        if isinstance(input_data, str) and not input_data:
-            return {"error": "input string must not be empty"}
-
-        return {}
+        return ModerationsRequest.validate_data(data)
 
     def _get_model_info(self) -> Dict[str, Any]:
         """Get information about the moderation model.
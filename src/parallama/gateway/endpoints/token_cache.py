@@ -0,0 +1,96 @@
+"""Per-handler memoization of token counts."""
+
+import asyncio
+from typing import Any, List, Tuple
+from cachetools import LRUCache
+
+from ...services.token_counter import TokenCounter
+
+class TokenCountCache:
+    """LRU cache of token counts keyed by (text, model).
+
+    Moderation batches and retried requests often repeat the same inputs;
+    a hit returns the stored count without awaiting the token counter.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of (text, model) entries to keep
+        """
+        self._counts: LRUCache = LRUCache(maxsize=maxsize)
+
+    async def count(self, token_counter: Any, text: str, model: str) -> int:
+        """Count tokens in text, using the cached value when available.
+
+        Args:
+            token_counter: Token counter service from app state
+            text: Text to count tokens in
+            model: Model name to use for counting
+
+        Returns:
+            int: Number of tokens, or 0 if counting failed
+        """
+        key: Tuple[str, str] = (text, model)
+        count = self._counts.get(key)
+        if count is not None:
+            return count
+
+        try:
+            tokens = await token_counter.count_tokens(text, model)
+        except (TypeError, ValueError):
+            # Failed counts are not cached so a later request can retry
+            return 0
+
+        # Handle mock token counter in tests
+        if not isinstance(tokens, (int, float)):
+            return 0
+
+        count = int(tokens)
+        self._counts[key] = count
+        return count
+
+    async def count_total(self, token_counter: Any, texts: List[str], model: str) -> int:
+        """Count the total tokens across several texts.
+
+        Uncached texts are counted together: with a single
+        count_tokens_batch call on a TokenCounter, otherwise with one
+        gathered count_tokens call per distinct text.
+
+        Args:
+            token_counter: Token counter service from app state
+            texts: Texts to count tokens in
+            model: Model name to use for counting
+
+        Returns:
+            int: Total number of tokens; texts whose count failed add 0
+        """
+        known = {}
+        misses = []
+        for text in dict.fromkeys(texts):
+            count = self._counts.get((text, model))
+            if count is None:
+                misses.append(text)
+            else:
+                known[text] = count
+
+        if misses:
+            if isinstance(token_counter, TokenCounter):
+                counts = await token_counter.count_tokens_batch(misses, model)
+            else:
+                counts = await asyncio.gather(
+                    *(token_counter.count_tokens(text, model) for text in misses),
+                    return_exceptions=True
+                )
+            for text, tokens in zip(misses, counts):
+                if isinstance(tokens, (TypeError, ValueError)):
+                    # Handle any token counting errors
+                    continue
+                if isinstance(tokens, BaseException):
+                    raise tokens
+                # Handle mock token counter in tests
+                if isinstance(tokens, (int, float)):
+                    known[text] = self._counts[(text, model)] = int(tokens)
+
+        return sum(known.get(text, 0) for text in texts)
@@ -0,0 +1,93 @@
+"""Process-wide HTTP client for upstream LLM requests."""
+
+from importlib.util import find_spec
+from typing import Optional
+import httpx
+
+# HTTP/2 needs the optional h2 package (pip install "parallama[http2]");
+# without it clients fall back to HTTP/1.1 keep-alive pooling
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+# Per-phase limits: a dead Ollama host fails fast on connect, while reads
+# keep the long budget slow generations need
+_DEFAULT_TIMEOUT = httpx.Timeout(connect=5.0, read=60.0, write=10.0, pool=5.0)
+
+# Many concurrent streams hold connections for minutes, so the pool is
+# well above httpx's defaults; idle connections are kept for 30s so bursts
+# of short JSON requests reuse them instead of reconnecting
+_DEFAULT_LIMITS = httpx.Limits(
+    max_connections=500,
+    max_keepalive_connections=200,
+    keepalive_expiry=30.0
+)
+
+# Connection attempts are retried; httpx never retries a request once it
+# has been sent, so this is safe for POSTs
+_DEFAULT_RETRIES = 2
+
+def build_client(
+    timeout: httpx.Timeout,
+    limits: httpx.Limits,
+    retries: int
+) -> httpx.AsyncClient:
+    """Create an upstream client with connection retries.
+
+    Args:
+        timeout: Per-phase request timeouts
+        limits: Connection pool limits
+        retries: Number of times to retry a failed connection attempt
+
+    Returns:
+        httpx.AsyncClient: The configured client
+    """
+    # With an explicit transport the client ignores its own limits and
+    # http2 arguments, so they are set on the transport
+    transport = httpx.AsyncHTTPTransport(
+        http2=HTTP2_AVAILABLE,
+        limits=limits,
+        retries=retries
+    )
+    return httpx.AsyncClient(timeout=timeout, transport=transport)
+
+# Created by the application lifespan and shared by every gateway so
+# keep-alive connections are reused across requests and gateway instances
+_shared_client: Optional[httpx.AsyncClient] = None
+
+def open_shared_client() -> httpx.AsyncClient:
+    """Create the shared client if it does not exist yet.
+
+    Returns:
+        httpx.AsyncClient: The shared client
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = build_client(
+            timeout=_DEFAULT_TIMEOUT,
+            limits=_DEFAULT_LIMITS,
+            retries=_DEFAULT_RETRIES
+        )
+    return _shared_client
+
+def get_shared_client() -> Optional[httpx.AsyncClient]:
+    """Get the shared client.
+
+    Returns:
+        Optional[httpx.AsyncClient]: The shared client, or None outside the
+        application lifespan
+    """
+    return _shared_client
+
+async def close_shared_client() -> None:
+    """Close the shared client and release its connections."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
+
+__all__ = [
+    "HTTP2_AVAILABLE",
+    "build_client",
+    "open_shared_client",
+    "get_shared_client",
+    "close_shared_client"
+]
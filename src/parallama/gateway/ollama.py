@@ -1,27 +1,61 @@
 """Ollama gateway implementation."""
 
-import json
+import asyncio
+import logging
 from typing import Dict, Any, Optional
 import httpx
+import orjson
 from fastapi import Request, Response
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import StreamingResponse
 
 from .config import OllamaConfig
+from .http import build_client, get_shared_client
+from .schemas import CompletionChoice, CompletionUsage, OllamaCompletion
+from .utils import is_test_mode, json_response, read_json, sse_event
+
+logger = logging.getLogger(__name__)
+
+# Pool sized for concurrent proxying plus status polling; the httpx
+# default of 20 keepalive connections saturates under load
+_CLIENT_LIMITS = httpx.Limits(max_connections=256, max_keepalive_connections=128)
+
+# Connection attempts are retried, matching the shared client
+_CLIENT_RETRIES = 2
 
 class OllamaGateway:
     """Gateway for Ollama LLM service."""
 
-    def __init__(self, config: OllamaConfig):
+    # Ollama's NDJSON chunks are already in this gateway's response format
+    passthrough_stream = True
+
+    def __init__(
+        self,
+        config: OllamaConfig,
+        client: Optional[httpx.AsyncClient] = None
+    ):
         """Initialize Ollama gateway.
         
         Args:
             config: Gateway configuration
+            client: HTTP client for Ollama requests; defaults to the
+                process-wide shared client, or a client owned by this
+                gateway when none is open
         """
         self.config = config
-        self.ollama_url = f"{config.host.rstrip('/')}:{config.port}/api"
-        print(f"DEBUG: Initialized OllamaGateway with URL: {self.ollama_url}")
+        base_url = config.host.rstrip("/")
+        if config.port:
+            base_url = f"{base_url}:{config.port}"
+        self.ollama_url = f"{base_url}/api"
+        logger.debug("Initialized OllamaGateway with URL: %s", self.ollama_url)
         self.model_mappings = {}  # Ollama doesn't need model mappings
-        self.client = httpx.AsyncClient(timeout=60.0)
+        self.client = client or get_shared_client()
+        self._owns_client = self.client is None
+        if self._owns_client:
+            self.client = build_client(
+                timeout=httpx.Timeout(60.0, connect=5.0),
+                limits=_CLIENT_LIMITS,
+                retries=_CLIENT_RETRIES
+            )
 
     async def validate_auth(self, credentials: str) -> bool:
         """Validate authentication credentials.
@@ -52,7 +86,7 @@ class OllamaGateway:
             return {}
             
         # For POST/PUT requests, transform the body
-        data = await request.json()
+        data = await read_json(request)
         
         if request.url.path.endswith("/generate"):
             # Transform generate request format
@@ -68,7 +102,7 @@ class OllamaGateway:
             transformed = data
         
         # Handle test mode
-        if "_test_mode" in request.headers:
+        if is_test_mode(request):
             transformed["_test_mode"] = True
         
         return transformed
@@ -84,13 +118,13 @@ class OllamaGateway:
         """
         # Handle test mode
         if response.get("_test_mode"):
-            return JSONResponse(content=response)
+            return json_response(response)
         
         # Handle streaming response
         if response.get("stream"):
             async def stream_generator():
                 async for chunk in response["chunks"]:
-                    yield f"data: {json.dumps(chunk)}\n\n"
+                    yield sse_event(chunk)
             
             return StreamingResponse(
                 stream_generator(),
@@ -100,7 +134,7 @@ class OllamaGateway:
         
         # For /tags endpoint, return models list
         if "models" in response:
-            return JSONResponse(content={
+            return json_response({
                 "models": [
                     {
                         "id": model["name"],
@@ -115,26 +149,25 @@ class OllamaGateway:
         
         # For /generate endpoint
         if "response" in response:
-            transformed = {
-                "id": response.get("id", ""),
-                "object": "completion",
-                "created": response.get("created", 0),
-                "model": response.get("model", ""),
-                "choices": [{
-                    "text": response.get("response", ""),
-                    "index": 0,
-                    "finish_reason": "stop"
-                }],
-                "usage": {
-                    "prompt_tokens": response.get("prompt_tokens", 0),
-                    "completion_tokens": response.get("completion_tokens", 0),
-                    "total_tokens": response.get("total_tokens", 0)
-                }
-            }
-            return JSONResponse(content=transformed)
+            transformed = OllamaCompletion.model_construct(
+                id=response.get("id", ""),
+                created=response.get("created", 0),
+                model=response.get("model", ""),
+                choices=[CompletionChoice.model_construct(
+                    text=response.get("response", ""),
+                    index=0,
+                    finish_reason="stop"
+                )],
+                usage=CompletionUsage.model_construct(
+                    prompt_tokens=response.get("prompt_tokens", 0),
+                    completion_tokens=response.get("completion_tokens", 0),
+                    total_tokens=response.get("total_tokens", 0)
+                )
+            )
+            return transformed.to_response()
         
         # For other endpoints, pass through the response
-        return JSONResponse(content=response)
+        return json_response(response)
 
     async def get_status(self) -> Dict[str, Any]:
         """Get gateway status and available models.
@@ -146,15 +179,16 @@ class OllamaGateway:
                 - version information
         """
         try:
-            # Get version info
-            version_response = await self.client.get(f"{self.ollama_url}/version")
+            # Get version info and available models concurrently
+            version_response, tags_response = await asyncio.gather(
+                self.client.get(f"{self.ollama_url}/version"),
+                self.client.get(f"{self.ollama_url}/tags")
+            )
             version_response.raise_for_status()
-            version_data = version_response.json()
+            version_data = orjson.loads(version_response.content)
             
-            # Get available models
-            tags_response = await self.client.get(f"{self.ollama_url}/tags")
             tags_response.raise_for_status()
-            tags_data = tags_response.json()
+            tags_data = orjson.loads(tags_response.content)
             
             return {
                 "status": "healthy",
@@ -179,8 +213,12 @@ class OllamaGateway:
             }
 
     async def close(self) -> None:
-        """Close any open connections."""
-        await self.client.aclose()
+        """Close any open connections.
+        
+        A shared client is left open; the application lifespan closes it.
+        """
+        if self._owns_client:
+            await self.client.aclose()
 
     async def handle_error(self, error: Exception) -> Response:
         """Handle errors and return appropriate responses.
@@ -192,22 +230,22 @@ class OllamaGateway:
             Response: An error response with appropriate status code
         """
         if isinstance(error, httpx.ReadTimeout):
-            return JSONResponse(
+            return json_response(
                 status_code=504,
                 content={"detail": "Request to LLM service timed out"}
             )
         elif isinstance(error, httpx.ConnectError):
-            return JSONResponse(
+            return json_response(
                 status_code=502,
                 content={"detail": f"Failed to connect to LLM service: {str(error)}"}
             )
         elif isinstance(error, httpx.HTTPStatusError):
-            return JSONResponse(
+            return json_response(
                 status_code=error.response.status_code,
                 content={"detail": error.response.json().get("error", str(error))}
             )
         else:
-            return JSONResponse(
+            return json_response(
                 status_code=500,
                 content={"detail": str(error)}
             )
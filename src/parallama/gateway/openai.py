@@ -1,40 +1,124 @@
 """OpenAI-compatible gateway implementation."""
 
-import json
-from typing import Dict, Any, List, Optional, AsyncGenerator
+import asyncio
+import copy
+import time
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, AsyncGenerator, AsyncIterator, Tuple
 import httpx
+import orjson
 from fastapi import Request, Response
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import StreamingResponse
 
 from .config import OpenAIConfig
+from .http import build_client, get_shared_client
+from .schemas import ChatChoice, ChatCompletion, ChatMessage, CompletionUsage
+from .utils import is_test_mode, json_response, read_json, sse_event
 from ..services.token_counter import TokenCounter
 from .endpoints import EmbeddingsHandler, EditsHandler, ModerationsHandler
 
+# Prompt prefixes for the chat roles kept in order; only the last user
+# message is used, and it is appended at the end
+_ROLE_PREFIXES = {
+    "system": "System: ",
+    "assistant": "Assistant: "
+}
+
+# Streamed completion text is buffered to roughly this many characters
+# before being passed to the token counter in one call
+_COUNT_FLUSH_CHARS = 256
+
+# Seconds a get_status result is served before Ollama is queried again
+_STATUS_TTL = 30.0
+
+# After a failed refresh, seconds before Ollama is queried again
+_STATUS_RETRY = 5.0
+
+# Fixed SSE control frames; [DONE] ends an OpenAI stream and the comment
+# frame keeps idle connections from timing out while the model is slow
+_SSE_DONE = b"data: [DONE]\n\n"
+_SSE_KEEPALIVE = b": ping\n\n"
+_KEEPALIVE_INTERVAL = 15.0
+
+async def _with_keepalive(
+    chunks: AsyncIterator[Dict[str, Any]],
+    interval: float
+) -> AsyncGenerator[Optional[Dict[str, Any]], None]:
+    """Relay chunks, yielding None whenever none arrives within interval.
+
+    The pending read is waited on rather than cancelled on timeout, since
+    cancelling an async generator's __anext__ would close it.
+
+    Args:
+        chunks: Source of stream chunks
+        interval: Seconds to wait for a chunk before yielding None
+
+    Yields:
+        Optional[Dict[str, Any]]: Each chunk, or None after an idle interval
+    """
+    iterator = chunks.__aiter__()
+    next_chunk: Optional[asyncio.Future] = None
+    try:
+        while True:
+            next_chunk = asyncio.ensure_future(iterator.__anext__())
+            while not (await asyncio.wait({next_chunk}, timeout=interval))[0]:
+                yield None
+            try:
+                chunk = next_chunk.result()
+            except StopAsyncIteration:
+                return
+            yield chunk
+    finally:
+        if next_chunk is not None and not next_chunk.done():
+            next_chunk.cancel()
+
 class OpenAIGateway:
     """Gateway providing OpenAI-compatible API."""
 
-    def __init__(self, config: OpenAIConfig):
+    def __init__(
+        self,
+        config: OpenAIConfig,
+        client: Optional[httpx.AsyncClient] = None
+    ):
         """Initialize OpenAI gateway.
         
         Args:
             config: Gateway configuration
+            client: HTTP client for Ollama requests; defaults to the
+                process-wide shared client, or a client owned by this
+                gateway when none is open
         """
         self.config = config
         self.ollama_url = "http://localhost:11434"
-        self.model_mappings = config.model_mappings
-        self.client = httpx.AsyncClient(
-            timeout=config.performance.request_timeout,
-            limits=httpx.Limits(
-                max_connections=config.performance.connection_pool_size,
-                max_keepalive_connections=config.performance.connection_pool_size
+        # Snapshot the mappings read-only and bind the lookup once, so
+        # per-request resolution is a single C-level call
+        self.model_mappings = MappingProxyType(dict(config.model_mappings))
+        self._resolve_model = self.model_mappings.get
+        self.client = client or get_shared_client()
+        self._owns_client = self.client is None
+        if self._owns_client:
+            self.client = build_client(
+                timeout=httpx.Timeout(config.performance.request_timeout, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=config.performance.connection_pool_size,
+                    max_keepalive_connections=config.performance.connection_pool_size
+                ),
+                retries=config.performance.max_retries
             )
-        )
         self.token_counter = TokenCounter(config.token_counter)
+        # (monotonic expiry time, status)
+        self._status_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._status_lock = asyncio.Lock()
         
         # Initialize endpoint handlers
         self.embeddings_handler = EmbeddingsHandler(config)
         self.edits_handler = EditsHandler(config)
         self.moderations_handler = ModerationsHandler(config)
+        self._endpoint_handlers = {
+            "embeddings": self.embeddings_handler,
+            "edits": self.edits_handler,
+            "moderations": self.moderations_handler
+        }
 
     async def validate_auth(self, credentials: str) -> bool:
         """Validate authentication credentials.
@@ -57,24 +141,50 @@ class OpenAIGateway:
         Returns:
             Response: The API response
         """
-        # Extract endpoint from path
-        path = request.url.path.lower()
-        
-        # Route to appropriate handler
-        if "/embeddings" in path:
-            return await self.embeddings_handler.handle_request(request)
-        elif "/edits" in path:
-            return await self.edits_handler.handle_request(request)
-        elif "/moderations" in path:
-            return await self.moderations_handler.handle_request(request)
-        else:
-            # Handle chat/completion requests
-            transformed_request = await self.transform_request(request)
-            response = await self.client.post(
-                f"{self.ollama_url}/api/generate",
-                json=transformed_request
+        # Route on the final path segment, e.g. /openai/v1/embeddings
+        endpoint = request.url.path.rstrip("/").rsplit("/", 1)[-1].lower()
+        handler = self._endpoint_handlers.get(endpoint)
+        if handler is not None:
+            return await handler.handle_request(request)
+
+        # Handle chat/completion requests
+        transformed_request = await self.transform_request(request)
+        upstream_request = self.client.build_request(
+            "POST",
+            f"{self.ollama_url}/api/generate",
+            content=orjson.dumps(transformed_request),
+            headers={"Content-Type": "application/json"}
+        )
+
+        if transformed_request.get("stream"):
+            # Relay NDJSON lines as they arrive instead of buffering
+            response = await self.client.send(upstream_request, stream=True)
+            return await self.transform_response(
+                {"stream": True, "chunks": self._iter_stream_chunks(response)},
+                request
             )
-            return await self.transform_response(response.json(), request)
+
+        response = await self.client.send(upstream_request)
+        return await self.transform_response(orjson.loads(response.content), request)
+
+    async def _iter_stream_chunks(
+        self,
+        response: httpx.Response
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Decode a streamed Ollama response one NDJSON line at a time.
+        
+        Args:
+            response: Upstream response opened with stream=True
+            
+        Yields:
+            Dict[str, Any]: Each decoded response chunk
+        """
+        try:
+            async for line in response.aiter_lines():
+                if line:
+                    yield orjson.loads(line)
+        finally:
+            await response.aclose()
 
     async def transform_request(self, request: Request) -> Dict[str, Any]:
         """Transform OpenAI request to Ollama format.
@@ -85,34 +195,29 @@ class OpenAIGateway:
         Returns:
             Dict[str, Any]: The transformed request data
         """
-        data = await request.json()
+        data = await read_json(request)
         
         # Map model name
         model = data.get("model", "gpt-3.5-turbo")
-        mapped_model = self.model_mappings.get(model, model)
+        mapped_model = self._resolve_model(model, model)
         
         # Handle chat completion request
         if "messages" in data:
             # Convert chat messages to prompt
             messages = data["messages"]
-            prompt_parts = []
-            
-            # Get the last user message
-            last_user_msg = None
-            for msg in messages:
-                role = msg["role"]
-                content = msg["content"]
-                
-                if role == "system":
-                    prompt_parts.append(f"System: {content}")
-                elif role == "assistant":
-                    prompt_parts.append(f"Assistant: {content}")
-                elif role == "user":
-                    last_user_msg = content
+            prompt_parts = [
+                _ROLE_PREFIXES[msg["role"]] + msg["content"]
+                for msg in messages
+                if msg["role"] in _ROLE_PREFIXES
+            ]
             
             # Add the last user message at the end
+            last_user_msg = next(
+                (msg["content"] for msg in reversed(messages) if msg["role"] == "user"),
+                None
+            )
             if last_user_msg:
-                prompt_parts.append(f"User: {last_user_msg}")
+                prompt_parts.append("User: " + last_user_msg)
             
             prompt = "\n".join(prompt_parts)
             
@@ -143,7 +248,7 @@ class OpenAIGateway:
         }
         
         # Handle test mode
-        if "_test_mode" in request.headers:
+        if is_test_mode(request):
             transformed["_test_mode"] = True
         
         return transformed
@@ -171,38 +276,60 @@ class OpenAIGateway:
                 "total_tokens": response["total_tokens"],
                 "_test_mode": True
             }
-            return JSONResponse(content=transformed)
+            return json_response(content=transformed)
         
         # Handle streaming response
         if response.get("stream"):
+            count_enabled = self.config.token_counter.enabled
+
             async def stream_generator():
                 completion_tokens = 0
-                async for chunk in response["chunks"]:
-                    # Count tokens in chunk if enabled
-                    if self.config.token_counter.enabled:
+                pending: List[str] = []
+                pending_len = 0
+                frame = self._format_stream_chunk({})
+                choice = frame["choices"][0]
+                delta = choice["delta"]
+
+                async def flush_count() -> None:
+                    nonlocal completion_tokens, pending_len
+                    completion_tokens += await self.token_counter.count_tokens(
+                        "".join(pending),
+                        request.state.model
+                    )
+                    request.state.completion_tokens = completion_tokens
+                    pending.clear()
+                    pending_len = 0
+
+                async for chunk in _with_keepalive(response["chunks"], _KEEPALIVE_INTERVAL):
+                    if chunk is None:
+                        yield _SSE_KEEPALIVE
+                        continue
+
+                    # Count tokens in batches rather than once per chunk
+                    if count_enabled:
                         content = chunk.get("response", "")
                         if content:
-                            tokens = await self.token_counter.count_tokens(
-                                content,
-                                request.state.model
-                            )
-                            completion_tokens += tokens
-                            request.state.completion_tokens = completion_tokens
-
-                    transformed_chunk = {
-                        "id": chunk.get("id", ""),
-                        "object": "chat.completion.chunk",
-                        "created": chunk.get("created", 0),
-                        "model": chunk.get("model", ""),
-                        "choices": [{
-                            "index": 0,
-                            "delta": {
-                                "content": chunk.get("response", "")
-                            },
-                            "finish_reason": "stop" if chunk.get("done") else None
-                        }]
-                    }
-                    yield f"data: {json.dumps(transformed_chunk)}\n\n"
+                            pending.append(content)
+                            pending_len += len(content)
+                        if pending and (
+                            pending_len >= _COUNT_FLUSH_CHARS or chunk.get("done")
+                        ):
+                            await flush_count()
+
+                    # orjson copies everything out while encoding, so the
+                    # stream's one frame dict is updated in place per chunk
+                    frame["id"] = chunk.get("id", "")
+                    frame["created"] = chunk.get("created", 0)
+                    frame["model"] = chunk.get("model", "")
+                    delta["content"] = chunk.get("response", "")
+                    choice["finish_reason"] = "stop" if chunk.get("done") else None
+                    yield sse_event(frame)
+
+                # Streams that end without a done chunk still get counted
+                if pending:
+                    await flush_count()
+
+                yield _SSE_DONE
             
             return StreamingResponse(
                 stream_generator(),
@@ -220,79 +347,111 @@ class OpenAIGateway:
             request.state.completion_tokens = completion_tokens
         
         # Transform regular response
-        transformed = {
-            "id": f"cmpl-{response.get('id', '')}",
-            "object": "chat.completion",
-            "created": response.get("created", 0),
-            "model": response.get("model", ""),
-            "choices": [{
-                "index": 0,
-                "message": {
-                    "role": "assistant",
-                    "content": response.get("response", "")
-                },
-                "finish_reason": "stop"
-            }],
-            "usage": {
-                "prompt_tokens": getattr(request.state, "prompt_tokens", 0),
-                "completion_tokens": completion_tokens,
-                "total_tokens": (
-                    getattr(request.state, "prompt_tokens", 0) + completion_tokens
-                )
-            }
-        }
-        
-        return JSONResponse(content=transformed)
+        prompt_tokens = getattr(request.state, "prompt_tokens", 0)
+        return ChatCompletion.model_construct(
+            id=f"cmpl-{response.get('id', '')}",
+            created=response.get("created", 0),
+            model=response.get("model", ""),
+            choices=[ChatChoice.model_construct(
+                index=0,
+                message=ChatMessage.model_construct(
+                    role="assistant",
+                    content=response.get("response", "")
+                ),
+                finish_reason="stop"
+            )],
+            usage=CompletionUsage.model_construct(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens
+            )
+        ).to_response()
 
     async def get_status(self) -> Dict[str, Any]:
         """Get gateway status and available models.
         
+        Results are cached for _STATUS_TTL seconds. If refreshing fails
+        while an older healthy result exists, that result is returned with
+        "stale": True instead of reporting the gateway unhealthy. Failed
+        refreshes are cached for _STATUS_RETRY seconds, so callers do not
+        queue up behind a probe of an unreachable Ollama.
+        
         Returns:
             Dict[str, Any]: Status information including:
                 - available models
                 - gateway health
                 - version information
         """
-        try:
-            # Get version info
-            version_response = await self.client.get(f"{self.ollama_url}/api/version")
-            await version_response.aread()  # Ensure response is fully read
-            await version_response.raise_for_status()  # Use await for async method
-            version_data = await version_response.json()  # Use await for async method
-            
-            # Get available models
-            tags_response = await self.client.get(f"{self.ollama_url}/api/tags")
-            await tags_response.aread()  # Ensure response is fully read
-            await tags_response.raise_for_status()  # Use await for async method
-            tags_data = await tags_response.json()  # Use await for async method
-            
-            return {
-                "status": "healthy",
-                "version": version_data.get("version"),
-                "models": [
-                    {
-                        "id": tag["name"],
-                        "object": "model",
-                        "owned_by": "ollama",
-                        "permission": []
+        # Callers get a deep copy, so mutating a result or its model list
+        # cannot alter the cache
+        cached = self._status_cache
+        if cached is not None and time.monotonic() < cached[0]:
+            return copy.deepcopy(cached[1])
+
+        # Concurrent misses wait for one refresh instead of each calling Ollama
+        async with self._status_lock:
+            cached = self._status_cache
+            if cached is not None and time.monotonic() < cached[0]:
+                return copy.deepcopy(cached[1])
+
+            try:
+                status = await self._fetch_status()
+                ttl = _STATUS_TTL
+            except Exception as e:
+                if cached is not None and cached[1]["status"] == "healthy":
+                    status = {**cached[1], "stale": True}
+                else:
+                    status = {
+                        "status": "unhealthy",
+                        "error": str(e),
+                        "gateway_type": "openai",
+                        "compatibility_mode": self.config.compatibility_mode
                     }
-                    for tag in tags_data
-                ],
-                "gateway_type": "openai",
-                "compatibility_mode": self.config.compatibility_mode
-            }
-            
-        except Exception as e:
-            return {
-                "status": "unhealthy",
-                "error": str(e),
-                "gateway_type": "openai",
-                "compatibility_mode": self.config.compatibility_mode
-            }
+                ttl = _STATUS_RETRY
+
+            self._status_cache = (time.monotonic() + ttl, status)
+            return copy.deepcopy(status)
+
+    async def _fetch_status(self) -> Dict[str, Any]:
+        """Query Ollama for its version and available models.
+        
+        Returns:
+            Dict[str, Any]: Healthy status information
+        """
+        # Get version info and available models concurrently; client.get
+        # returns with the body already read
+        version_response, tags_response = await asyncio.gather(
+            self.client.get(f"{self.ollama_url}/api/version"),
+            self.client.get(f"{self.ollama_url}/api/tags")
+        )
+        version_response.raise_for_status()
+        tags_response.raise_for_status()
+        version_data = orjson.loads(version_response.content)
+        tags_data = orjson.loads(tags_response.content)
+        
+        return {
+            "status": "healthy",
+            "version": version_data.get("version"),
+            "models": [
+                {
+                    "id": tag["name"],
+                    "object": "model",
+                    "owned_by": "ollama",
+                    "permission": []
+                }
+                for tag in tags_data
+            ],
+            "gateway_type": "openai",
+            "compatibility_mode": self.config.compatibility_mode
+        }
 
     async def close(self) -> None:
-        """Close any open connections."""
-        await self.client.aclose()
+        """Close any open connections.
+        
+        A shared client is left open; the application lifespan closes it.
+        """
+        if self._owns_client:
+            await self.client.aclose()
 
     async def handle_error(self, error: Exception) -> Response:
         """Handle errors and return appropriate responses.
@@ -304,22 +463,22 @@ class OpenAIGateway:
             Response: An error response with appropriate status code
         """
         if isinstance(error, httpx.ReadTimeout):
-            return JSONResponse(
+            return json_response(
                 status_code=504,
                 content={"detail": "Request to LLM service timed out"}
             )
         elif isinstance(error, httpx.ConnectError):
-            return JSONResponse(
+            return json_response(
                 status_code=502,
                 content={"detail": f"Failed to connect to LLM service: {str(error)}"}
             )
         elif isinstance(error, httpx.HTTPStatusError):
-            return JSONResponse(
+            return json_response(
                 status_code=error.response.status_code,
                 content={"detail": error.response.json().get("error", str(error))}
             )
         else:
-            return JSONResponse(
+            return json_response(
                 status_code=500,
                 content={"detail": str(error)}
             )
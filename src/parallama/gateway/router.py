@@ -1,17 +1,59 @@
 """Gateway router for handling API requests."""
 
-import json
-from datetime import datetime
-from typing import Dict, Any
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncGenerator, Dict, Optional, Tuple
 from fastapi import APIRouter, Request, Response, HTTPException, Depends
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import StreamingResponse
 import httpx
+import orjson
 
 from . import GatewayType, GatewayRegistry
+from .http import open_shared_client
+from .utils import is_test_mode, json_response, sse_event
 from ..core.exceptions import GatewayError
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(tags=["gateway"])
 
+# GatewayType is fixed at import, so its values are listed once
+_SUPPORTED_TYPES = tuple(gt.value for gt in GatewayType)
+
+# Discovery is a global snapshot, so polling clients share one result per
+# _DISCOVERY_TTL seconds instead of each triggering status checks
+_DISCOVERY_TTL = 5.0
+_discovery_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+_discovery_lock: Optional[asyncio.Lock] = None
+
+async def _passthrough_stream(response: httpx.Response) -> AsyncGenerator[bytes, None]:
+    """Frame upstream NDJSON lines as SSE events without decoding them.
+
+    Lines are split on the raw bytes, since transport chunks do not align
+    with line boundaries, and each non-empty line is sent as-is.
+
+    Args:
+        response: Upstream response opened with stream=True
+
+    Yields:
+        bytes: One SSE frame per upstream line
+    """
+    pending = b""
+    try:
+        async for data in response.aiter_bytes():
+            *lines, pending = (pending + data).split(b"\n")
+            for line in lines:
+                line = line.strip()
+                if line:
+                    yield b"data: %b\n\n" % line
+        pending = pending.strip()
+        if pending:
+            yield b"data: %b\n\n" % pending
+    finally:
+        await response.aclose()
+
 async def get_gateway_status(gateway_name: str) -> Dict[str, Any]:
     """Get status information for a specific gateway.
     
@@ -33,6 +75,30 @@ async def get_gateway_status(gateway_name: str) -> Dict[str, Any]:
     except Exception as e:
         raise GatewayError(f"Failed to get status for gateway '{gateway_name}': {str(e)}")
 
+_UNAVAILABLE = {"status": "unavailable", "info": None}
+
+async def _probe(gateway_name: str) -> Dict[str, Any]:
+    """Build the discovery entry for a gateway.
+    
+    Unlike get_gateway_status, a missing or failing gateway is reported
+    in the returned entry rather than raised.
+    
+    Args:
+        gateway_name: Name of the gateway to check
+        
+    Returns:
+        Dict[str, Any]: The gateway's status and info
+    """
+    gateway = GatewayRegistry.get_gateway(gateway_name)
+    if not gateway:
+        return dict(_UNAVAILABLE)
+    
+    try:
+        info = await gateway.get_status()
+    except Exception:
+        return dict(_UNAVAILABLE)
+    return {"status": "available", "info": info}
+
 @router.get("/discovery")
 async def discover_gateways() -> Dict[str, Any]:
     """List all available gateways and their status.
@@ -43,26 +109,42 @@ async def discover_gateways() -> Dict[str, Any]:
         - Status information for each gateway
         - Supported features and capabilities
     """
-    gateways = GatewayRegistry.list_gateways()
+    global _discovery_cache, _discovery_lock
+    cached = _discovery_cache
+    if cached is not None and time.monotonic() - cached[0] < _DISCOVERY_TTL:
+        return cached[1]
+
+    # Created on first use so it binds to the running event loop
+    if _discovery_lock is None:
+        _discovery_lock = asyncio.Lock()
+
+    # Concurrent misses share one round of status checks
+    async with _discovery_lock:
+        cached = _discovery_cache
+        if cached is not None and time.monotonic() - cached[0] < _DISCOVERY_TTL:
+            return cached[1]
+
+        result = await _discover()
+        _discovery_cache = (time.monotonic(), result)
+        return result
+
+async def _discover() -> Dict[str, Any]:
+    """Query every registered gateway for its status.
     
-    gateway_info = {}
-    for name, _ in gateways.items():
-        try:
-            status = await get_gateway_status(name)
-            gateway_info[name] = {
-                "status": "available",
-                "info": status
-            }
-        except GatewayError:
-            gateway_info[name] = {
-                "status": "unavailable",
-                "info": None
-            }
+    Returns:
+        Dict[str, Any]: The discovery response body
+    """
+    names = list(GatewayRegistry.list_gateways())
+    
+    # Check every gateway concurrently; discovery takes as long as the
+    # slowest status call rather than their sum
+    entries = await asyncio.gather(*(_probe(name) for name in names))
+    gateway_info = dict(zip(names, entries))
     
     return {
         "gateways": gateway_info,
-        "supported_types": [gt.value for gt in GatewayType],
-        "timestamp": datetime.utcnow().isoformat()
+        "supported_types": _SUPPORTED_TYPES,
+        "timestamp": datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
     }
 
 @router.api_route("/{gateway_type}/v1/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
@@ -71,7 +153,6 @@ async def route_request(
     path: str,
     request: Request
 ) -> Response:
-    print(f"DEBUG: Received request for gateway_type={gateway_type}, path={path}")
     """Route requests to appropriate gateway implementation.
     
     Args:
@@ -85,6 +166,7 @@ async def route_request(
     Raises:
         HTTPException: If gateway is not found or request fails
     """
+    logger.debug("Received request for gateway_type=%s, path=%s", gateway_type, path)
     gateway = GatewayRegistry.get_gateway(gateway_type)
     if not gateway:
         raise HTTPException(
@@ -94,7 +176,7 @@ async def route_request(
     
     try:
         # Validate authentication
-        auth_header = request.headers.get("Authorization")
+        auth_header = request.headers.get("authorization")
         if not auth_header:
             raise HTTPException(
                 status_code=401,
@@ -112,124 +194,140 @@ async def route_request(
         transformed_request = await gateway.transform_request(request)
         
         # Check for test mode
-        if "_test_mode" in request.headers:
+        if is_test_mode(request):
             transformed_request["_test_mode"] = True
             return await gateway.transform_response(transformed_request)
         
-        # Forward request to LLM service
-        async with httpx.AsyncClient() as client:
-            try:
-                # Check if this is a streaming request
-                is_streaming = transformed_request.get("stream", False)
-                
-                # Determine the method and endpoint
-                method = request.method.lower()
-                # Map endpoints for Ollama compatibility
-                if gateway_type == "ollama":
-                    if path == "models":
-                        path = "tags"
-                    elif path == "chat/completions":
-                        path = "chat"
-                endpoint = f"{gateway.ollama_url}/{path}"
-                
-                print(f"DEBUG: Gateway URL base: {gateway.ollama_url}")
-                print(f"DEBUG: Request path: {path}")
-                print(f"DEBUG: Full endpoint URL: {endpoint}")
-                print(f"DEBUG: Making {method.upper()} request")
-                
-                # Make request to LLM service
-                response = await client.request(
-                    method,
-                    endpoint,
-                    json=transformed_request if method in ["post", "put"] else None,
-                    headers={"Content-Type": "application/json"},
-                    timeout=60.0  # Longer timeout for LLM requests
-                )
-                
-                print(f"DEBUG: Response status: {response.status_code}")
-                print(f"DEBUG: Response content: {response.text}")
-                
-                # Handle errors
-                response.raise_for_status()
-                
-                # Handle streaming response
-                if is_streaming:
-                    async def stream_generator():
+        # Forward request to LLM service; the shared client keeps upstream
+        # connections alive across requests
+        client = open_shared_client()
+        try:
+            # Check if this is a streaming request
+            is_streaming = transformed_request.get("stream", False)
+            
+            # Determine the method and endpoint
+            method = request.method.lower()
+            # Map endpoints for Ollama compatibility
+            if gateway_type == "ollama":
+                if path == "models":
+                    path = "tags"
+                elif path == "chat/completions":
+                    path = "chat"
+            endpoint = f"{gateway.ollama_url}/{path}"
+            
+            logger.debug("Forwarding %s request to %s", method.upper(), endpoint)
+            
+            # Make request to LLM service; streamed replies are relayed as
+            # they arrive instead of being buffered first
+            upstream_request = client.build_request(
+                method,
+                endpoint,
+                content=(
+                    orjson.dumps(transformed_request)
+                    if method in ["post", "put"] else None
+                ),
+                headers={"Content-Type": "application/json"}
+            )
+            response = await client.send(upstream_request, stream=is_streaming)
+            
+            logger.debug("Upstream response status: %s", response.status_code)
+            
+            # Handle errors; a streamed error body is read before the
+            # connection is released so handle_error can report its detail
+            if is_streaming and response.is_error:
+                try:
+                    await response.aread()
+                finally:
+                    await response.aclose()
+            response.raise_for_status()
+            
+            # Handle streaming response
+            if is_streaming:
+                async def stream_generator():
+                    try:
                         async for line in response.aiter_lines():
                             if line.strip():
                                 try:
-                                    chunk = json.loads(line)
-                                    yield f"data: {json.dumps(chunk)}\n\n"
-                                except json.JSONDecodeError:
+                                    chunk = orjson.loads(line)
+                                except orjson.JSONDecodeError:
                                     continue
-                    
-                    return StreamingResponse(
-                        stream_generator(),
-                        media_type="text/event-stream",
-                        headers={"Cache-Control": "no-cache"}
-                    )
+                                yield sse_event(chunk)
+                    finally:
+                        await response.aclose()
                 
-                # Transform non-streaming response
-                try:
-                    # Handle Ollama's chat response which comes as multiple JSON objects
-                    if gateway_type == "ollama" and path == "chat":
-                        # Get the last complete message (the one with done=true)
-                        lines = response.text.strip().split('\n')
-                        for line in reversed(lines):
+                if getattr(gateway, "passthrough_stream", False):
+                    chunks = _passthrough_stream(response)
+                else:
+                    chunks = stream_generator()
+                return StreamingResponse(
+                    chunks,
+                    media_type="text/event-stream",
+                    headers={"Cache-Control": "no-cache"}
+                )
+            
+            # Transform non-streaming response
+            try:
+                # Handle Ollama's chat response which comes as multiple JSON objects
+                if gateway_type == "ollama" and path == "chat":
+                    # Decode each NDJSON line once, straight from the raw bytes
+                    chunks = []
+                    for line in response.content.splitlines():
+                        if line.strip():
                             try:
-                                data = json.loads(line)
-                                if data.get("done", False):
-                                    # Combine all message content
-                                    content = ""
-                                    for msg_line in lines:
-                                        try:
-                                            msg_data = json.loads(msg_line)
-                                            if not msg_data.get("done", False):
-                                                content += msg_data.get("message", {}).get("content", "")
-                                        except json.JSONDecodeError:
-                                            continue
-                                    return JSONResponse(content={
-                                        "id": data.get("id", ""),
-                                        "object": "chat.completion",
-                                        "created": data.get("created_at"),
-                                        "model": data.get("model"),
-                                        "choices": [{
-                                            "index": 0,
-                                            "message": {
-                                                "role": "assistant",
-                                                "content": content
-                                            },
-                                            "finish_reason": data.get("done_reason", "stop")
-                                        }],
-                                        "usage": {
-                                            "prompt_tokens": data.get("prompt_eval_count", 0),
-                                            "completion_tokens": data.get("eval_count", 0),
-                                            "total_tokens": (data.get("prompt_eval_count", 0) + data.get("eval_count", 0))
-                                        }
-                                    })
-                            except json.JSONDecodeError:
+                                chunks.append(orjson.loads(line))
+                            except orjson.JSONDecodeError:
                                 continue
+
+                    # The last complete message (the one with done=true)
+                    data = next(
+                        (chunk for chunk in reversed(chunks) if chunk.get("done", False)),
+                        None
+                    )
+                    if data is None:
                         raise ValueError("No complete response found")
-                    else:
-                        # For other endpoints, handle as before
-                        text = response.text.replace('""', '","')
-                        text = text.replace('"}{"', '"},{"')
-                        response_data = json.loads(text)
-                        print(f"DEBUG: Parsed JSON: {json.dumps(response_data, indent=2)}")
-                        return await gateway.transform_response(response_data)
-                except (json.JSONDecodeError, ValueError) as e:
-                    print(f"DEBUG: JSON parse error: {str(e)}")
-                    return await gateway.handle_error(e)
-                
-            except httpx.ReadTimeout:
-                return await gateway.handle_error(httpx.ReadTimeout("Request to LLM service timed out"))
-            except httpx.ConnectError as e:
-                return await gateway.handle_error(httpx.ConnectError(f"Failed to connect to LLM service: {str(e)}"))
-            except httpx.HTTPStatusError as e:
-                return await gateway.handle_error(e)
-            except Exception as e:
+
+                    # Combine all message content
+                    content = "".join(
+                        chunk.get("message", {}).get("content", "")
+                        for chunk in chunks
+                        if not chunk.get("done", False)
+                    )
+                    return json_response(content={
+                        "id": data.get("id", ""),
+                        "object": "chat.completion",
+                        "created": data.get("created_at"),
+                        "model": data.get("model"),
+                        "choices": [{
+                            "index": 0,
+                            "message": {
+                                "role": "assistant",
+                                "content": content
+                            },
+                            "finish_reason": data.get("done_reason", "stop")
+                        }],
+                        "usage": {
+                            "prompt_tokens": data.get("prompt_eval_count", 0),
+                            "completion_tokens": data.get("eval_count", 0),
+                            "total_tokens": (data.get("prompt_eval_count", 0) + data.get("eval_count", 0))
+                        }
+                    })
+                else:
+                    # For other endpoints, parse the body bytes directly
+                    response_data = orjson.loads(response.content)
+                    return await gateway.transform_response(response_data)
+            except (orjson.JSONDecodeError, ValueError) as e:
+                logger.debug("Upstream response parse error: %s", e)
                 return await gateway.handle_error(e)
             
+        except httpx.ReadTimeout:
+            return await gateway.handle_error(httpx.ReadTimeout("Request to LLM service timed out"))
+        except httpx.ConnectError as e:
+            return await gateway.handle_error(httpx.ConnectError(f"Failed to connect to LLM service: {str(e)}"))
+        except httpx.HTTPStatusError as e:
+            return await gateway.handle_error(e)
+        except Exception as e:
+            return await gateway.handle_error(e)
+        
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,224 @@
+"""Request and response models for the OpenAI-compatible gateway endpoints.
+
+Request models validate incoming bodies in pydantic-core. Each maps
+validation errors back to the endpoint's error messages.
+
+Handlers build response models with model_construct, since every field
+comes from trusted server-side values. They serialize them with
+model_dump_json, so pydantic-core writes the body directly rather than
+FastAPI re-encoding a dict.
+"""
+
+from typing import Annotated, Any, ClassVar, Dict, List, Tuple, Union
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from fastapi import Response
+
+class _RequestModel(BaseModel):
+    """Base class for validated request bodies."""
+
+    model_config = ConfigDict(strict=True)
+
+    # ((field, pydantic error type), message) in priority order; an error
+    # type of "*" matches any error on the field
+    _error_messages: ClassVar[Tuple[Tuple[Tuple[str, str], str], ...]] = ()
+
+    @classmethod
+    def validate_data(cls, data: Any) -> Dict[str, str]:
+        """Validate a decoded request body.
+
+        Args:
+            data: Request data
+
+        Returns:
+            Dict[str, str]: Error message if validation fails, empty dict if successful
+        """
+        try:
+            cls.model_validate(data)
+        except ValidationError as e:
+            return {"error": cls._error_message(e.errors(include_url=False))}
+        return {}
+
+    @classmethod
+    def _error_message(cls, errors: List[Dict[str, Any]]) -> str:
+        """Pick the endpoint error message for a set of validation errors.
+
+        Args:
+            errors: Errors reported by pydantic
+
+        Returns:
+            str: The highest-priority matching message
+        """
+        found = {(error["loc"][0], error["type"]) for error in errors if error["loc"]}
+        if not found:
+            return "request body must be a JSON object"
+
+        fields = {field for field, _ in found}
+        for (field, error_type), message in cls._error_messages:
+            if (field, error_type) in found or (error_type == "*" and field in fields):
+                return message
+        return f"{errors[0]['loc'][0]} is invalid"
+
+class EditsRequest(_RequestModel):
+    """Request body for the edits endpoint."""
+
+    instruction: str
+    input: str = ""
+    n: Annotated[int, Field(ge=1, le=20)] = 1
+    temperature: Annotated[float, Field(ge=0, le=2)] = 0.7
+
+    _error_messages = (
+        (("instruction", "missing"), "instruction is required"),
+        (("instruction", "*"), "instruction must be a string"),
+        (("input", "*"), "input must be a string"),
+        (("n", "*"), "n must be an integer between 1 and 20"),
+        (("temperature", "*"), "temperature must be a number between 0 and 2")
+    )
+
+class EmbeddingsRequest(_RequestModel):
+    """Request body for the embeddings endpoint."""
+
+    input: Union[str, Annotated[List[str], Field(min_length=1, max_length=100)]]
+
+    _error_messages = (
+        (("input", "missing"), "input is required"),
+        (("input", "too_short"), "input must not be empty"),
+        (("input", "too_long"), "maximum of 100 items allowed for embeddings"),
+        (("input", "list_type"), "input must be a string or array of strings"),
+        (("input", "string_type"), "all input items must be strings")
+    )
+
+class ModerationsRequest(_RequestModel):
+    """Request body for the moderations endpoint."""
+
+    input: Union[
+        Annotated[str, Field(min_length=1)],
+        Annotated[List[str], Field(min_length=1, max_length=100)]
+    ]
+
+    _error_messages = (
+        (("input", "missing"), "input is required"),
+        (("input", "string_too_short"), "input string must not be empty"),
+        (("input", "too_short"), "input array must not be empty"),
+        (("input", "too_long"), "maximum of 100 items allowed for moderation"),
+        (("input", "list_type"), "input must be a string or array of strings"),
+        (("input", "string_type"), "all input items must be strings")
+    )
+
+class _ResponseModel(BaseModel):
+    """Base class for gateway response bodies."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=False)
+
+    def to_response(self, status_code: int = 200) -> Response:
+        """Serialize the model into a JSON response.
+
+        Args:
+            status_code: HTTP status code for the response
+
+        Returns:
+            Response: JSON response with the serialized model as its body
+        """
+        return Response(
+            content=self.model_dump_json(),
+            media_type="application/json",
+            status_code=status_code
+        )
+
+class Usage(BaseModel):
+    """Token usage for requests without a completion."""
+
+    prompt_tokens: int
+    total_tokens: int
+
+class CompletionUsage(BaseModel):
+    """Token usage for requests that generate text."""
+
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+class EditChoice(BaseModel):
+    """A single edited text."""
+
+    text: str
+    index: int
+
+class EditResponse(_ResponseModel):
+    """Response body for the edits endpoint."""
+
+    object: str = "edit"
+    created: int
+    choices: List[EditChoice]
+    usage: CompletionUsage
+
+class ModerationResult(BaseModel):
+    """Moderation verdict for a single input text."""
+
+    flagged: bool
+    categories: Dict[str, bool]
+    category_scores: Dict[str, float]
+
+class ModerationResponse(_ResponseModel):
+    """Response body for the moderations endpoint."""
+
+    id: str
+    model: str
+    results: List[ModerationResult]
+    usage: Usage
+
+class CompletionChoice(BaseModel):
+    """A single completion choice."""
+
+    text: str
+    index: int
+    finish_reason: str
+
+class OllamaCompletion(_ResponseModel):
+    """Ollama /generate result in OpenAI completion format."""
+
+    id: str
+    object: str = "completion"
+    created: int
+    model: str
+    choices: List[CompletionChoice]
+    usage: CompletionUsage
+
+class ChatMessage(BaseModel):
+    """A chat message returned by the model."""
+
+    role: str
+    content: str
+
+class ChatChoice(BaseModel):
+    """A single chat completion choice."""
+
+    index: int
+    message: ChatMessage
+    finish_reason: str
+
+class ChatCompletion(_ResponseModel):
+    """Non-streaming chat completion in OpenAI format."""
+
+    id: str
+    object: str = "chat.completion"
+    created: int
+    model: str
+    choices: List[ChatChoice]
+    usage: CompletionUsage
+
+__all__ = [
+    "EditsRequest",
+    "EmbeddingsRequest",
+    "ModerationsRequest",
+    "Usage",
+    "CompletionUsage",
+    "EditChoice",
+    "EditResponse",
+    "ModerationResult",
+    "ModerationResponse",
+    "CompletionChoice",
+    "OllamaCompletion",
+    "ChatMessage",
+    "ChatChoice",
+    "ChatCompletion"
+]
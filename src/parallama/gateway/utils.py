@@ -0,0 +1,87 @@
+"""Shared helpers for gateway request handling."""
+
+from typing import Any, Dict
+import orjson
+from fastapi import Request, Response
+
+# ASGI scope key holding the decoded body; the scope is shared by every
+# Request object built for the same HTTP request
+_JSON_SCOPE_KEY = "parallama.json"
+
+# Raw ASGI header names are lowercase bytes
+_TEST_MODE_HEADER = b"_test_mode"
+
+# Embedding vectors are numpy rows, and some payloads use non-str keys
+_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+async def read_json(request: Request) -> Any:
+    """Decode a request body with orjson.
+
+    Starlette's Request.json() uses the stdlib decoder; this reads the
+    raw body once and parses it with orjson instead. The result is kept
+    in the request scope so later calls for the same request reuse it.
+
+    Args:
+        request: The incoming FastAPI request
+
+    Returns:
+        Any: The decoded JSON body
+
+    Raises:
+        orjson.JSONDecodeError: If the body is not valid JSON
+    """
+    scope = request.scope
+    if _JSON_SCOPE_KEY in scope:
+        return scope[_JSON_SCOPE_KEY]
+
+    data = orjson.loads(await request.body())
+    scope[_JSON_SCOPE_KEY] = data
+    return data
+
+def is_test_mode(request: Request) -> bool:
+    """Check whether a request carries the _test_mode header.
+
+    Scans the raw ASGI header list directly rather than going through
+    request.headers, which builds a Headers wrapper and lowercases the
+    name on every lookup.
+
+    Args:
+        request: The incoming FastAPI request
+
+    Returns:
+        bool: True if the header is present
+    """
+    return any(key == _TEST_MODE_HEADER for key, _ in request.scope["headers"])
+
+def sse_event(payload: Dict[str, Any]) -> bytes:
+    """Encode a payload as a server-sent event frame.
+
+    The frame is built as bytes so StreamingResponse sends it without a
+    further UTF-8 encode; orjson appends the first newline itself.
+
+    Args:
+        payload: JSON-serializable event data
+
+    Returns:
+        bytes: The encoded event frame
+    """
+    return b"data: %b\n" % orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE)
+
+def json_response(content: Any, status_code: int = 200) -> Response:
+    """Serialize a payload with orjson into a JSON response.
+
+    Used for plain dict payloads in place of FastAPI's deprecated
+    ORJSONResponse; pydantic models use their own to_response().
+
+    Args:
+        content: JSON-serializable response body
+        status_code: HTTP status code
+
+    Returns:
+        Response: Response whose body is the orjson-encoded content
+    """
+    return Response(
+        content=orjson.dumps(content, option=_JSON_OPTIONS),
+        status_code=status_code,
+        media_type="application/json"
+    )
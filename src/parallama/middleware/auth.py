@@ -1,66 +1,134 @@
 """Authentication middleware for API endpoints."""
 
-from functools import wraps
-from typing import Callable, List, Optional, Tuple
+import asyncio
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from fastapi import Request, HTTPException, Depends
+from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from redis import Redis
 
 from ..services.auth import AuthService, TokenError
 from ..services.api_key import APIKeyService
-from ..core.database import get_db, get_redis
+from ..core.database import db_session, get_redis
 from ..models.user import User
 
 security = HTTPBearer()
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> User:
-    """Get current user from token or API key.
+# Supported authorization schemes, lowercased
+_BEARER = "bearer"
+_API_KEY = "apikey"
+
+def _auth_scheme(credentials: HTTPAuthorizationCredentials) -> str:
+    """Get the lowercased authorization scheme.
+    
+    Runs before any database or Redis work, so a request with an
+    unsupported scheme is rejected without opening a session.
     
     Args:
         credentials: Authorization credentials
         
     Returns:
-        User: Authenticated user
+        str: _BEARER or _API_KEY
         
     Raises:
-        HTTPException: If authentication fails
+        HTTPException: If the scheme is not supported
     """
-    try:
-        # Get services
-        db = next(get_db())
-        redis = next(get_redis())
-        auth_service = AuthService(db, redis)
-        api_key_service = APIKeyService(db, redis)
-
-        # Check token type
-        auth_type = credentials.scheme.lower()
-        token = credentials.credentials
+    auth_type = credentials.scheme.lower()
+    if auth_type != _BEARER and auth_type != _API_KEY:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid authentication scheme"
+        )
+    return auth_type
 
-        if auth_type == "bearer":
-            # Verify JWT token
-            user_id, _ = auth_service.verify_token(token)
-        elif auth_type == "apikey":
-            # Verify API key
-            user_id = api_key_service.verify_key(token)
-        else:
-            raise HTTPException(
-                status_code=401,
-                detail="Invalid authentication scheme"
-            )
+# JWT verification results keyed by token. Each request runs in its own
+# task, and so its own context, so results never outlive the request
+_TokenResults = Dict[str, Tuple[UUID, Optional[list]]]
+_token_results: ContextVar[Optional[_TokenResults]] = ContextVar(
+    "token_results", default=None
+)
 
-        # Get user
-        user = db.query(User).filter(User.id == str(user_id)).first()
-        if not user:
-            raise HTTPException(
-                status_code=404,
-                detail="User not found"
-            )
+def _request_token_results() -> _TokenResults:
+    """Get the JWT verification results for the current request.
+    
+    The dict is bound in the request's context on first use and handed
+    to worker threads explicitly, so every dependency of one request
+    shares it.
+    
+    Returns:
+        _TokenResults: Verified (user ID, permissions) by token
+    """
+    results = _token_results.get()
+    if results is None:
+        results = {}
+        _token_results.set(results)
+    return results
+
+def _verify_token(
+    db: Session,
+    redis: Redis,
+    token: str,
+    results: _TokenResults
+) -> Tuple[UUID, Optional[list]]:
+    """Verify a JWT once per request.
+    
+    Args:
+        db: Database session for the AuthService
+        redis: Redis client for the AuthService
+        token: JWT token to verify
+        results: The request's verification results
+        
+    Returns:
+        Tuple[UUID, Optional[list]]: User ID and optional permissions
+        
+    Raises:
+        TokenError: If token is invalid or expired
+    """
+    result = results.get(token)
+    if result is None:
+        # The service is only built when the token is not yet verified
+        result = results[token] = AuthService(db, redis).verify_token(token)
+    return result
+
+def _load_user(
+    credentials: HTTPAuthorizationCredentials,
+    auth_type: str,
+    results: _TokenResults,
+    user_id: Optional[UUID] = None
+) -> User:
+    """Load the user for a set of credentials.
+    
+    Blocking: verifies the token and queries the database and Redis
+    synchronously, so callers run it in a worker thread. When user_id is
+    given the credentials are already verified and only the user query
+    runs.
+    """
+    try:
+        # Get services; db_session closes the session on exit
+        with db_session() as db:
+            redis = get_redis()
+            token = credentials.credentials
+
+            if user_id is None:
+                if auth_type == _BEARER:
+                    # Verify JWT token
+                    user_id, _ = _verify_token(db, redis, token, results)
+                else:
+                    # Verify API key
+                    user_id = APIKeyService(db, redis).verify_key(token)
+
+            # Get user
+            user = db.query(User).filter(User.id == str(user_id)).first()
+            if not user:
+                raise HTTPException(
+                    status_code=404,
+                    detail="User not found"
+                )
 
-        return user
+            return user
 
     except TokenError as e:
         raise HTTPException(
@@ -72,48 +140,52 @@ async def get_current_user(
             status_code=500,
             detail=f"Authentication error: {str(e)}"
         )
-    finally:
-        db.close()
-        redis.close()
 
-async def get_current_user_id(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> Optional[UUID]:
-    """Get current user ID from token or API key.
+) -> User:
+    """Get current user from token or API key.
     
     Args:
         credentials: Authorization credentials
         
     Returns:
-        Optional[UUID]: User ID if authenticated, None otherwise
+        User: Authenticated user
         
     Raises:
         HTTPException: If authentication fails
     """
+    auth_type = _auth_scheme(credentials)
+    results = _request_token_results()
+    user_id = None
+    if auth_type == _BEARER and credentials.credentials in results:
+        user_id = results[credentials.credentials][0]
+    # The lookup uses blocking SQLAlchemy and Redis clients; keep it off
+    # the event loop
+    return await asyncio.to_thread(
+        _load_user, credentials, auth_type, results, user_id
+    )
+
+def _load_user_id(
+    credentials: HTTPAuthorizationCredentials,
+    auth_type: str,
+    results: _TokenResults
+) -> Optional[UUID]:
+    """Blocking counterpart of get_current_user_id."""
     try:
         # Get services
-        db = next(get_db())
-        redis = next(get_redis())
-        auth_service = AuthService(db, redis)
-        api_key_service = APIKeyService(db, redis)
-
-        # Check token type
-        auth_type = credentials.scheme.lower()
-        token = credentials.credentials
-
-        if auth_type == "bearer":
-            # Verify JWT token
-            user_id, _ = auth_service.verify_token(token)
-            return user_id
-        elif auth_type == "apikey":
-            # Verify API key
-            user_id = api_key_service.verify_key(token)
-            return user_id
-        else:
-            raise HTTPException(
-                status_code=401,
-                detail="Invalid authentication scheme"
-            )
+        with db_session() as db:
+            redis = get_redis()
+            token = credentials.credentials
+
+            if auth_type == _BEARER:
+                # Verify JWT token
+                user_id, _ = _verify_token(db, redis, token, results)
+                return user_id
+            else:
+                # Verify API key
+                user_id = APIKeyService(db, redis).verify_key(token)
+                return user_id
 
     except TokenError as e:
         raise HTTPException(
@@ -125,40 +197,40 @@ async def get_current_user_id(
             status_code=500,
             detail=f"Authentication error: {str(e)}"
         )
-    finally:
-        db.close()
-        redis.close()
 
-async def get_current_user_permissions(
+async def get_current_user_id(
     credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> Optional[List[str]]:
-    """Get current user permissions from token.
+) -> Optional[UUID]:
+    """Get current user ID from token or API key.
     
     Args:
         credentials: Authorization credentials
         
     Returns:
-        Optional[List[str]]: User permissions if authenticated with JWT, None otherwise
+        Optional[UUID]: User ID if authenticated, None otherwise
         
     Raises:
         HTTPException: If authentication fails
     """
+    auth_type = _auth_scheme(credentials)
+    results = _request_token_results()
+    if auth_type == _BEARER and credentials.credentials in results:
+        return results[credentials.credentials][0]
+    return await asyncio.to_thread(_load_user_id, credentials, auth_type, results)
+
+def _load_user_permissions(
+    credentials: HTTPAuthorizationCredentials,
+    results: _TokenResults
+) -> Optional[List[str]]:
+    """Blocking counterpart of get_current_user_permissions."""
     try:
         # Get services
-        db = next(get_db())
-        redis = next(get_redis())
-        auth_service = AuthService(db, redis)
-
-        # Check token type
-        auth_type = credentials.scheme.lower()
-        token = credentials.credentials
-
-        if auth_type == "bearer":
+        with db_session() as db:
             # Verify JWT token and get permissions
-            _, permissions = auth_service.verify_token(token)
+            _, permissions = _verify_token(
+                db, get_redis(), credentials.credentials, results
+            )
             return permissions
-        else:
-            return None
 
     except TokenError as e:
         raise HTTPException(
@@ -170,129 +242,85 @@ async def get_current_user_permissions(
             status_code=500,
             detail=f"Authentication error: {str(e)}"
         )
-    finally:
-        db.close()
-        redis.close()
 
-def requires_permission(permission: str) -> Callable:
-    """Decorator to require a specific permission.
+async def get_current_user_permissions(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Optional[List[str]]:
+    """Get current user permissions from token.
     
     Args:
-        permission: Required permission
+        credentials: Authorization credentials
+        
+    Returns:
+        Optional[List[str]]: User permissions if authenticated with JWT, None otherwise
+        
+    Raises:
+        HTTPException: If authentication fails
+    """
+    # Only JWTs carry permissions; other schemes need no lookup
+    if credentials.scheme.lower() != _BEARER:
+        return None
+    # A token already verified for this request needs no worker thread
+    results = _request_token_results()
+    if credentials.credentials in results:
+        return results[credentials.credentials][1]
+    return await asyncio.to_thread(_load_user_permissions, credentials, results)
+
+def _permission_check(predicate: Callable[[List[str]], bool]) -> Callable:
+    """Build a dependency that checks the user's permissions.
+    
+    FastAPI caches get_current_user_permissions (and the security scheme
+    under it) per request, so several checks on one endpoint share a
+    single token verification.
+    
+    Args:
+        predicate: Returns True if the user's permissions grant access
         
     Returns:
-        Callable: Decorator function
+        Callable: Dependency raising 403 when access is denied
     """
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            request = kwargs.get("request")
-            if not request:
-                for arg in args:
-                    if isinstance(arg, Request):
-                        request = arg
-                        break
-
-            if not request:
-                raise HTTPException(
-                    status_code=500,
-                    detail="Request object not found"
-                )
-
-            # Get user permissions
-            permissions = await get_current_user_permissions(
-                await security(request)
+    async def dependency(
+        permissions: Optional[List[str]] = Depends(get_current_user_permissions)
+    ) -> None:
+        if not permissions or not predicate(permissions):
+            raise HTTPException(
+                status_code=403,
+                detail="Permission denied"
             )
+    return dependency
 
-            # Check permission
-            if not permissions or permission not in permissions:
-                raise HTTPException(
-                    status_code=403,
-                    detail="Permission denied"
-                )
-
-            return await func(*args, **kwargs)
-        return wrapper
-    return decorator
+def requires_permission(permission: str) -> Callable:
+    """Dependency requiring a specific permission.
+    
+    Example:
+        @router.get("/users", dependencies=[Depends(requires_permission("manage_users"))])
+    
+    Args:
+        permission: Required permission
+        
+    Returns:
+        Callable: Dependency for use with Depends()
+    """
+    return _permission_check(lambda granted: permission in granted)
 
 def requires_any_permission(permissions: List[str]) -> Callable:
-    """Decorator to require any of the specified permissions.
+    """Dependency requiring any of the specified permissions.
     
     Args:
         permissions: List of permissions, any of which grant access
         
     Returns:
-        Callable: Decorator function
+        Callable: Dependency for use with Depends()
     """
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            request = kwargs.get("request")
-            if not request:
-                for arg in args:
-                    if isinstance(arg, Request):
-                        request = arg
-                        break
-
-            if not request:
-                raise HTTPException(
-                    status_code=500,
-                    detail="Request object not found"
-                )
-
-            # Get user permissions
-            user_permissions = await get_current_user_permissions(
-                await security(request)
-            )
-
-            # Check permissions
-            if not user_permissions or not any(p in user_permissions for p in permissions):
-                raise HTTPException(
-                    status_code=403,
-                    detail="Permission denied"
-                )
-
-            return await func(*args, **kwargs)
-        return wrapper
-    return decorator
+    return _permission_check(lambda granted: any(p in granted for p in permissions))
 
 def requires_all_permissions(permissions: List[str]) -> Callable:
-    """Decorator to require all specified permissions.
+    """Dependency requiring all specified permissions.
     
     Args:
         permissions: List of permissions, all of which are required
         
     Returns:
-        Callable: Decorator function
+        Callable: Dependency for use with Depends()
     """
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            request = kwargs.get("request")
-            if not request:
-                for arg in args:
-                    if isinstance(arg, Request):
-                        request = arg
-                        break
-
-            if not request:
-                raise HTTPException(
-                    status_code=500,
-                    detail="Request object not found"
-                )
-
-            # Get user permissions
-            user_permissions = await get_current_user_permissions(
-                await security(request)
-            )
-
-            # Check permissions
-            if not user_permissions or not all(p in user_permissions for p in permissions):
-                raise HTTPException(
-                    status_code=403,
-                    detail="Permission denied"
-                )
-
-            return await func(*args, **kwargs)
-        return wrapper
-    return decorator
+    return _permission_check(lambda granted: all(p in granted for p in permissions))
@@ -1,22 +1,31 @@
 """Rate limiting middleware for API gateways."""
 
-from datetime import datetime
-from typing import Callable, Optional
+import time
+from typing import Any, Callable, Optional
 from uuid import UUID
 
 import redis
 
 from fastapi import Request, Response, HTTPException
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.types import ASGIApp
-from starlette.datastructures import State, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from ..core.database import get_db
+from ..gateway.utils import json_response
 from ..services.rate_limit import RateLimitService
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware for enforcing rate limits on API requests."""
+# Request state removed once a rate-limited request completes
+_REQUEST_STATE_KEYS = (
+    "start_time", "start_counter", "tokens_used", "model_name",
+    "error_message", "status_code", "gateway_type"
+)
+
+class RateLimitMiddleware:
+    """Middleware for enforcing rate limits on API requests.
+    
+    Implemented as a plain ASGI app rather than a BaseHTTPMiddleware, so
+    responses, including token streams, go straight to the server without
+    an extra task and memory stream per request.
+    """
 
     def __init__(
         self,
@@ -31,129 +40,121 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             get_user_id: Function to extract user ID from request
             get_gateway_type: Function to determine gateway type from request
         """
-        super().__init__(app)
+        self.app = app
         self.get_user_id = get_user_id
         self.get_gateway_type = get_gateway_type
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: RequestResponseEndpoint
-    ) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process the request and apply rate limiting.
         
         Args:
-            request: The incoming request
-            call_next: Function to call the next middleware/endpoint
-            
-        Returns:
-            The response from the next middleware/endpoint
-            
-        Raises:
-            HTTPException: If rate limit is exceeded
+            scope: The ASGI connection scope
+            receive: The ASGI receive channel
+            send: The ASGI send channel
         """
-        # Initialize request state
-        request.state.start_time = datetime.utcnow().timestamp()
-        request.state.tokens_used = None
-        request.state.model_name = None
-        request.state.error_message = None
-        request.state.status_code = None
-        request.state.gateway_type = None
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Initialize request state; Request.state reads and writes this dict
+        state = scope.setdefault("state", {})
+        state.update(
+            # Wall-clock epoch; handlers use it for response timestamps
+            start_time=time.time(),
+            # Monotonic reference for the recorded request duration
+            start_counter=time.perf_counter(),
+            tokens_used=None,
+            model_name=None,
+            error_message=None,
+            status_code=None,
+            gateway_type=None
+        )
 
         # Skip rate limiting for non-API routes
-        if not request.url.path.startswith(("/ollama/", "/openai/")):
-            return await call_next(request)
+        path = scope["path"]
+        if not path.startswith(("/ollama/", "/openai/")):
+            await self.app(scope, receive, send)
+            return
 
+        # Only built for the user and gateway callbacks
+        request = Request(scope, receive)
         user_id = self.get_user_id(request)
         if not user_id:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         gateway_type = self.get_gateway_type(request)
-        request.state.gateway_type = gateway_type
+        state["gateway_type"] = gateway_type
 
-        # Initialize rate limit service
-        db = next(get_db())
+        # Initialize rate limit service; the session is closed in the
+        # finally block below, returning its connection to the pool
+        db = get_db()
         rate_limit_service = RateLimitService(db)
 
+        async def record_usage(
+            status_code: int,
+            error_message: Optional[str],
+            duration: int = 0
+        ) -> None:
+            await rate_limit_service.record_usage(
+                user_id=user_id,
+                gateway_type=gateway_type,
+                endpoint=path,
+                tokens=state["tokens_used"],
+                model_name=state["model_name"],
+                duration=duration,
+                status_code=status_code,
+                error_message=error_message
+            )
+
+        response_started = False
+        replaced = False
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started, replaced, status_code
+            if message["type"] == "http.response.start":
+                response_started = True
+                status_code = message["status"]
+                # If there's an error message, override the response
+                if state["error_message"]:
+                    replaced = True
+                    status_code = state["status_code"] or 500
+                    await _error_response(status_code, state["error_message"])(
+                        scope, receive, send
+                    )
+                    return
+            elif replaced:
+                # Drop the body of the replaced response
+                return
+            await send(message)
+
         try:
             # Check rate limits before processing
             try:
                 await rate_limit_service.check_rate_limit(
                     user_id=user_id,
                     gateway_type=gateway_type,
-                    tokens=request.state.tokens_used
+                    tokens=state["tokens_used"]
                 )
             except redis.ConnectionError:
                 error_message = "Rate limiting service unavailable"
-                await rate_limit_service.record_usage(
-                    user_id=user_id,
-                    gateway_type=gateway_type,
-                    endpoint=request.url.path,
-                    tokens=request.state.tokens_used,
-                    model_name=request.state.model_name,
-                    duration=0,
-                    status_code=503,
-                    error_message=error_message
-                )
-                return JSONResponse(
-                    status_code=503,
-                    content={"detail": error_message}
-                )
+                await record_usage(503, error_message)
+                await _error_response(503, error_message)(scope, receive, send)
+                return
             except HTTPException as e:
-                await rate_limit_service.record_usage(
-                    user_id=user_id,
-                    gateway_type=gateway_type,
-                    endpoint=request.url.path,
-                    tokens=request.state.tokens_used,
-                    model_name=request.state.model_name,
-                    duration=0,
-                    status_code=e.status_code,
-                    error_message=str(e.detail)
-                )
-                return JSONResponse(
-                    status_code=e.status_code,
-                    content={"detail": e.detail}
-                )
+                await record_usage(e.status_code, str(e.detail))
+                await _error_response(e.status_code, e.detail)(scope, receive, send)
+                return
 
             # Process the request
             try:
-                response = await call_next(request)
-                request.state.end_time = datetime.utcnow().timestamp()
-                duration = int((request.state.end_time - request.state.start_time) * 1000)
-
-                # If there's an error message, override the response
-                if request.state.error_message:
-                    status_code = request.state.status_code or 500
-                    await rate_limit_service.record_usage(
-                        user_id=user_id,
-                        gateway_type=gateway_type,
-                        endpoint=request.url.path,
-                        tokens=request.state.tokens_used,
-                        model_name=request.state.model_name,
-                        duration=duration,
-                        status_code=status_code,
-                        error_message=request.state.error_message
-                    )
-                    return JSONResponse(
-                        status_code=status_code,
-                        content={"detail": request.state.error_message}
-                    )
-
-                # Record successful usage
-                await rate_limit_service.record_usage(
-                    user_id=user_id,
-                    gateway_type=gateway_type,
-                    endpoint=request.url.path,
-                    tokens=request.state.tokens_used,
-                    model_name=request.state.model_name,
-                    duration=duration,
-                    status_code=response.status_code,
-                    error_message=request.state.error_message
-                )
-
-                return response
-
+                await self.app(scope, receive, send_wrapper)
             except Exception as e:
+                # Once headers are out the error can only abort the response
+                if response_started:
+                    raise
+
                 # Record error
                 error_message = str(e)
                 status_code = 500
@@ -161,21 +162,21 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     status_code = e.status_code
                     error_message = e.detail
 
-                await rate_limit_service.record_usage(
-                    user_id=user_id,
-                    gateway_type=gateway_type,
-                    endpoint=request.url.path,
-                    tokens=request.state.tokens_used,
-                    model_name=request.state.model_name,
-                    duration=int((datetime.utcnow().timestamp() - request.state.start_time) * 1000),
-                    status_code=status_code,
-                    error_message=error_message
+                await record_usage(
+                    status_code,
+                    error_message,
+                    int((time.perf_counter() - state["start_counter"]) * 1000)
                 )
+                await _error_response(status_code, error_message)(scope, receive, send)
+                return
 
-                return JSONResponse(
-                    status_code=status_code,
-                    content={"detail": error_message}
-                )
+            # Recorded after the body is sent, so streamed token counts
+            # and durations are complete
+            await record_usage(
+                status_code,
+                state["error_message"],
+                int((time.perf_counter() - state["start_counter"]) * 1000)
+            )
 
         finally:
             try:
@@ -185,13 +186,8 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             db.close()
 
             # Clean up request state
-            for attr in [
-                'start_time', 'end_time', 'tokens_used',
-                'model_name', 'error_message', 'status_code',
-                'gateway_type'
-            ]:
-                if hasattr(request.state, attr):
-                    delattr(request.state, attr)
+            for key in _REQUEST_STATE_KEYS:
+                state.pop(key, None)
 
     @staticmethod
     def get_gateway_type_from_path(request: Request) -> str:
@@ -212,10 +208,22 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     async def cleanup(self):
         """Cleanup resources when the application shuts down."""
         try:
-            db = next(get_db())
+            db = get_db()
             rate_limit_service = RateLimitService(db)
             await rate_limit_service.cleanup()
             rate_limit_service.close()
             db.close()
         except:
             pass
+
+def _error_response(status_code: int, detail: Any) -> Response:
+    """Build the JSON error response sent by the middleware.
+    
+    Args:
+        status_code: HTTP status code
+        detail: Error detail
+        
+    Returns:
+        Response: Response to call as an ASGI app
+    """
+    return json_response({"detail": detail}, status_code=status_code)
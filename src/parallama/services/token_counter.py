@@ -89,6 +89,38 @@ class TokenCounter:
             self._cache[cache_key] = token_count
             return token_count
 
+    async def count_tokens_batch(self, texts: List[str], model: str) -> List[int]:
+        """Count tokens in several texts with a single call.
+
+        Args:
+            texts: Plain texts to count tokens in
+            model: Model name to use for counting
+
+        Returns:
+            List[int]: Number of tokens for each text, in input order
+        """
+        counts: List[Optional[int]] = [None] * len(texts)
+        misses: Dict[str, List[int]] = {}
+        for index, text in enumerate(texts):
+            cache_key = (text, model)
+            if cache_key in self._cache:
+                self._hits += 1
+                counts[index] = self._cache[cache_key]
+            else:
+                misses.setdefault(text, []).append(index)
+
+        if misses:
+            self._misses += len(misses)
+            async with self._lock:
+                encoder = self._get_encoder(model)
+                for text, indexes in misses.items():
+                    token_count = len(encoder.encode(text))
+                    self._cache[(text, model)] = token_count
+                    for index in indexes:
+                        counts[index] = token_count
+
+        return counts
+
     async def estimate_streaming_tokens(
         self,
         stream: AsyncGenerator[Dict[str, str], None],
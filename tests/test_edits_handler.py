@@ -1,5 +1,8 @@
 """Tests for the edits endpoint handler."""
 
+from dataclasses import replace
+
+import orjson
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from fastapi import Request
@@ -42,11 +45,11 @@ async def test_edits_basic_request(edits_handler):
     mock_request.app.state.token_counter.count_tokens.return_value = 5
     mock_request.state.start_time = 1234567890
     
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "text-davinci-edit-001",
         "input": "teh cat",
         "instruction": "Fix spelling"
-    }
+    })
     
     response = await edits_handler.handle_request(mock_request)
     assert response.status_code == 200
@@ -68,13 +71,13 @@ async def test_edits_multiple_outputs(edits_handler):
     mock_request.app.state.token_counter.count_tokens.return_value = 3
     mock_request.state.start_time = 1234567890
     
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "text-davinci-edit-001",
         "input": "hello world",
         "instruction": "Make variations",
         "n": 3,
         "temperature": 0.8
-    }
+    })
     
     response = await edits_handler.handle_request(mock_request)
     assert response.status_code == 200
@@ -90,15 +93,18 @@ async def test_edits_multiple_outputs(edits_handler):
 @pytest.mark.asyncio
 async def test_edits_disabled(edits_config):
     """Test behavior when edits endpoint is disabled."""
-    edits_config.endpoints.edits = False
+    edits_config = replace(
+        edits_config,
+        endpoints=replace(edits_config.endpoints, edits=False)
+    )
     handler = EditsHandler(edits_config)
     
     mock_request = AsyncMock()
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "text-davinci-edit-001",
         "input": "test",
         "instruction": "uppercase"
-    }
+    })
     
     response = await handler.handle_request(mock_request)
     assert response.status_code == 404
@@ -162,18 +168,21 @@ async def test_edits_validation(edits_handler):
 @pytest.mark.asyncio
 async def test_edits_token_counting_disabled(edits_config):
     """Test behavior when token counting is disabled."""
-    edits_config.token_counter.enabled = False
+    edits_config = replace(
+        edits_config,
+        token_counter=replace(edits_config.token_counter, enabled=False)
+    )
     handler = EditsHandler(edits_config)
     
     mock_request = AsyncMock()
     mock_request.app = MagicMock()
     mock_request.app.state.token_counter = AsyncMock()
     mock_request.state.start_time = 1234567890
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "text-davinci-edit-001",
         "input": "test",
         "instruction": "uppercase"
-    }
+    })
     
     response = await handler.handle_request(mock_request)
     assert response.status_code == 200
@@ -198,28 +207,28 @@ async def test_edits_specific_instructions(edits_handler):
     mock_request.state.start_time = 1234567890
     
     # Test uppercase instruction
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "input": "hello world",
         "instruction": "uppercase"
-    }
+    })
     response = await edits_handler.handle_request(mock_request)
     data = eval(response.body.decode())
     assert data["choices"][0]["text"] == "HELLO WORLD"
     
     # Test lowercase instruction
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "input": "HELLO WORLD",
         "instruction": "lowercase"
-    }
+    })
     response = await edits_handler.handle_request(mock_request)
     data = eval(response.body.decode())
     assert data["choices"][0]["text"] == "hello world"
     
     # Test spell fix instruction
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "input": "teh recieve",
         "instruction": "fix spelling"
-    }
+    })
     response = await edits_handler.handle_request(mock_request)
     data = eval(response.body.decode())
     assert data["choices"][0]["text"] == "the receive"
@@ -233,12 +242,12 @@ async def test_edits_temperature_effect(edits_handler):
     mock_request.state.start_time = 1234567890
     
     # Test with low temperature
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "input": "hello",
         "instruction": "test",
         "n": 3,
         "temperature": 0.1
-    }
+    })
     response = await edits_handler.handle_request(mock_request)
     data = eval(response.body.decode())
     texts = [choice["text"] for choice in data["choices"]]
@@ -246,12 +255,12 @@ async def test_edits_temperature_effect(edits_handler):
     assert all("variation" not in text for text in texts)
     
     # Test with high temperature
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "input": "hello",
         "instruction": "test",
         "n": 3,
         "temperature": 0.8
-    }
+    })
     response = await edits_handler.handle_request(mock_request)
     data = eval(response.body.decode())
     texts = [choice["text"] for choice in data["choices"]]
@@ -1,5 +1,8 @@
 """Tests for the embeddings endpoint handler."""
 
+from dataclasses import replace
+
+import orjson
 import pytest
 import numpy as np
 from unittest.mock import AsyncMock, MagicMock
@@ -42,10 +45,10 @@ async def test_embeddings_single_text(embeddings_handler):
     mock_request.app.state.token_counter = AsyncMock()
     mock_request.app.state.token_counter.count_tokens.return_value = 5
     
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "text-embedding-ada-002",
         "input": "Hello, world!"
-    }
+    })
     
     response = await embeddings_handler.handle_request(mock_request)
     assert response.status_code == 200
@@ -68,10 +71,10 @@ async def test_embeddings_batch(embeddings_handler):
     mock_request.app.state.token_counter = AsyncMock()
     mock_request.app.state.token_counter.count_tokens.return_value = 3
     
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "text-embedding-ada-002",
         "input": ["Hello", "World", "!"]
-    }
+    })
     
     response = await embeddings_handler.handle_request(mock_request)
     assert response.status_code == 200
@@ -89,14 +92,17 @@ async def test_embeddings_batch(embeddings_handler):
 @pytest.mark.asyncio
 async def test_embeddings_disabled(embeddings_config):
     """Test behavior when embeddings endpoint is disabled."""
-    embeddings_config.endpoints.embeddings = False
+    embeddings_config = replace(
+        embeddings_config,
+        endpoints=replace(embeddings_config.endpoints, embeddings=False)
+    )
     handler = EmbeddingsHandler(embeddings_config)
     
     mock_request = AsyncMock()
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "text-embedding-ada-002",
         "input": "test"
-    }
+    })
     
     response = await handler.handle_request(mock_request)
     assert response.status_code == 404
@@ -132,16 +138,19 @@ async def test_embeddings_validation(embeddings_handler):
 @pytest.mark.asyncio
 async def test_embeddings_token_counting_disabled(embeddings_config):
     """Test behavior when token counting is disabled."""
-    embeddings_config.token_counter.enabled = False
+    embeddings_config = replace(
+        embeddings_config,
+        token_counter=replace(embeddings_config.token_counter, enabled=False)
+    )
     handler = EmbeddingsHandler(embeddings_config)
     
     mock_request = AsyncMock()
     mock_request.app = MagicMock()
     mock_request.app.state.token_counter = AsyncMock()
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "text-embedding-ada-002",
         "input": "test"
-    }
+    })
     
     response = await handler.handle_request(mock_request)
     assert response.status_code == 200
@@ -164,19 +173,19 @@ async def test_embeddings_dimensions(embeddings_handler):
     mock_request.app.state.token_counter = AsyncMock()
     
     # Test OpenAI model dimension
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "text-embedding-ada-002",
         "input": "test"
-    }
+    })
     response = await embeddings_handler.handle_request(mock_request)
     data = eval(response.body.decode())
     assert len(data["data"][0]["embedding"]) == 1536
     
     # Test Llama model dimension
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "llama2",
         "input": "test"
-    }
+    })
     response = await embeddings_handler.handle_request(mock_request)
     data = eval(response.body.decode())
     assert len(data["data"][0]["embedding"]) == 4096
@@ -187,10 +196,10 @@ async def test_embeddings_reproducibility(embeddings_handler):
     mock_request = AsyncMock()
     mock_request.app = MagicMock()
     mock_request.app.state.token_counter = AsyncMock()
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "text-embedding-ada-002",
         "input": "test"
-    }
+    })
     
     # Generate embeddings twice
     response1 = await embeddings_handler.handle_request(mock_request)
@@ -211,10 +220,10 @@ async def test_embeddings_normalization(embeddings_handler):
     mock_request = AsyncMock()
     mock_request.app = MagicMock()
     mock_request.app.state.token_counter = AsyncMock()
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "text-embedding-ada-002",
         "input": "test"
-    }
+    })
     
     response = await embeddings_handler.handle_request(mock_request)
     data = eval(response.body.decode())
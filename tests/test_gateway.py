@@ -39,6 +39,18 @@ def test_gateway_registration(test_config):
     
     GatewayRegistry.clear()
 
+def test_gateway_registration_requires_async():
+    """Test that gateways with sync request methods are rejected."""
+    GatewayRegistry.clear()
+    
+    class SyncGateway(MockGateway):
+        def get_status(self):
+            return {"status": "healthy"}
+    
+    with pytest.raises(TypeError, match="get_status"):
+        GatewayRegistry.register(GatewayType.OLLAMA, SyncGateway)
+    assert GatewayType.OLLAMA not in GatewayRegistry.list_gateways()
+
 def test_gateway_config():
     """Test gateway configuration."""
     config = GatewayConfig(
@@ -46,8 +58,8 @@ def test_gateway_config():
         base_path="/test",
         enabled=True,
         rate_limits=RateLimitConfig(
-            requests_per_hour=100,
-            requests_per_day=1000
+            requests_per_minute=1,
+            requests_per_hour=100
         )
     )
     
@@ -71,6 +83,30 @@ def test_gateway_discovery():
     
     GatewayRegistry.clear()
 
+@pytest.mark.asyncio
+async def test_gateway_initialize_all(test_config):
+    """Test eager gateway construction and shutdown."""
+    GatewayRegistry.clear()
+    
+    GatewayRegistry.register(GatewayType.OLLAMA, MockGateway)
+    GatewayRegistry.register(GatewayType.OPENAI, MockGateway)
+    
+    # Only configured gateway types are instantiated
+    GatewayRegistry.initialize_all({GatewayType.OLLAMA: test_config})
+    gateway = GatewayRegistry.get_gateway(GatewayType.OLLAMA)
+    assert isinstance(gateway, MockGateway)
+    assert GatewayRegistry.get_gateway(GatewayType.OPENAI) is None
+    
+    # Same instance is returned on every lookup
+    assert GatewayRegistry.get_gateway(GatewayType.OLLAMA) is gateway
+    
+    with patch.object(gateway, "close", AsyncMock()) as mock_close:
+        await GatewayRegistry.close_all()
+        mock_close.assert_awaited_once()
+    assert GatewayRegistry.get_gateway(GatewayType.OLLAMA) is None
+    
+    GatewayRegistry.clear()
+
 @pytest.mark.asyncio
 async def test_gateway_routing(test_gateway):
     """Test request routing through gateway."""
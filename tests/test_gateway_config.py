@@ -1,5 +1,4 @@
 import pytest
-from pydantic import ValidationError
 from parallama.gateway import (
     GatewayType,
     GatewayConfig,
@@ -21,7 +20,7 @@ def test_rate_limit_config_validation():
     assert config.requests_per_hour == 3600
     
     # Test hourly rate validation
-    with pytest.raises(ValidationError) as exc_info:
+    with pytest.raises(ValueError) as exc_info:
         RateLimitConfig(
             requests_per_minute=60,
             requests_per_hour=1000  # Less than requests_per_minute * 60
@@ -29,10 +28,10 @@ def test_rate_limit_config_validation():
     assert "Hourly rate must be >= per-minute rate * 60" in str(exc_info.value)
     
     # Test minimum values
-    with pytest.raises(ValidationError):
+    with pytest.raises(ValueError):
         RateLimitConfig(requests_per_minute=0)
     
-    with pytest.raises(ValidationError):
+    with pytest.raises(ValueError):
         RateLimitConfig(requests_per_hour=0)
 
 def test_gateway_config_validation():
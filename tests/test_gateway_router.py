@@ -300,3 +300,42 @@ def test_error_response_format(client, setup_gateways):
     )
     assert response.status_code == 400
     assert response.json()["detail"] == "Invalid request"
+
+class _ErrorStream(httpx.AsyncByteStream):
+    """Upstream error body that is only available by reading the stream."""
+
+    async def __aiter__(self):
+        yield b'{"error": "model not found"}'
+
+class _StreamingErrorTransport(httpx.AsyncBaseTransport):
+    """Transport answering every request with an unread 404 stream."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404, stream=_ErrorStream())
+
+class ErrorReportingGateway(WorkingGateway):
+    """Gateway reporting upstream errors with their detail."""
+
+    async def handle_error(self, error: Exception) -> JSONResponse:
+        if isinstance(error, httpx.HTTPStatusError):
+            return JSONResponse(
+                status_code=error.response.status_code,
+                content={"detail": error.response.json()["error"]}
+            )
+        return JSONResponse(status_code=500, content={"detail": str(error)})
+
+def test_streaming_upstream_error(client, setup_gateways):
+    """Test that a streamed upstream error keeps its status and detail."""
+    gateway = ErrorReportingGateway()
+    gateway._transform_request_mock.return_value = {"stream": True}
+    GatewayRegistry._instances["working"] = gateway
+
+    upstream = httpx.AsyncClient(transport=_StreamingErrorTransport())
+    with patch("parallama.gateway.router.open_shared_client", return_value=upstream):
+        response = client.post(
+            "/working/v1/chat",
+            headers={"Authorization": "valid-token"},
+            json={"stream": True}
+        )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "model not found"
@@ -1,6 +1,9 @@
 """Tests for the moderations endpoint handler."""
 
 import json
+from dataclasses import replace
+
+import orjson
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from fastapi import Request
@@ -40,9 +43,9 @@ async def test_moderations_basic_request(moderations_handler):
     mock_request.app.state.token_counter.count_tokens.return_value = 5
     mock_request.state.start_time = 1234567890
     
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "input": "Hello, world!"
-    }
+    })
     
     response = await moderations_handler.handle_request(mock_request)
     assert response.status_code == 200
@@ -66,9 +69,9 @@ async def test_moderations_batch_request(moderations_handler):
     mock_request.app.state.token_counter.count_tokens.return_value = 3
     mock_request.state.start_time = 1234567890
     
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "input": ["Hello", "World", "Test"]
-    }
+    })
     
     response = await moderations_handler.handle_request(mock_request)
     assert response.status_code == 200
@@ -79,16 +82,38 @@ async def test_moderations_batch_request(moderations_handler):
     assert len(response_json["results"]) == 3
     assert response_json["usage"]["prompt_tokens"] == 9  # 3 tokens per text
 
+@pytest.mark.asyncio
+async def test_moderations_token_count_cache(moderations_handler):
+    """Test repeated inputs are only counted once."""
+    mock_request = AsyncMock()
+    mock_request.app = MagicMock()
+    mock_request.app.state.token_counter = AsyncMock()
+    mock_request.app.state.token_counter.count_tokens.return_value = 4
+    mock_request.state.start_time = 1234567890
+
+    mock_request.body.return_value = orjson.dumps({
+        "input": ["Hello", "Hello", "Hello"]
+    })
+
+    response = await moderations_handler.handle_request(mock_request)
+    response_json = json.loads(response.body.decode())
+
+    assert response_json["usage"]["prompt_tokens"] == 12
+    assert mock_request.app.state.token_counter.count_tokens.await_count == 1
+
 @pytest.mark.asyncio
 async def test_moderations_disabled(moderations_config):
     """Test behavior when moderations endpoint is disabled."""
-    moderations_config.endpoints.moderations = False
+    moderations_config = replace(
+        moderations_config,
+        endpoints=replace(moderations_config.endpoints, moderations=False)
+    )
     handler = ModerationsHandler(moderations_config)
     
     mock_request = AsyncMock()
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "input": "test"
-    }
+    })
     
     response = await handler.handle_request(mock_request)
     assert response.status_code == 404
@@ -145,16 +170,19 @@ async def test_moderations_validation(moderations_handler):
 @pytest.mark.asyncio
 async def test_moderations_token_counting_disabled(moderations_config):
     """Test behavior when token counting is disabled."""
-    moderations_config.token_counter.enabled = False
+    moderations_config = replace(
+        moderations_config,
+        token_counter=replace(moderations_config.token_counter, enabled=False)
+    )
     handler = ModerationsHandler(moderations_config)
     
     mock_request = AsyncMock()
     mock_request.app = MagicMock()
     mock_request.app.state.token_counter = AsyncMock()
     mock_request.state.start_time = 1234567890
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "input": "test"
-    }
+    })
     
     response = await handler.handle_request(mock_request)
     assert response.status_code == 200
@@ -178,27 +206,27 @@ async def test_moderations_content_detection(moderations_handler):
     mock_request.state.start_time = 1234567890
     
     # Test safe content
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "input": "Hello, this is a friendly message!"
-    }
+    })
     response = await moderations_handler.handle_request(mock_request)
     data = json.loads(response.body.decode())
     assert not data["results"][0]["flagged"]
     assert not any(data["results"][0]["categories"].values())
     
     # Test hate content
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "input": "I hate everyone and want to discriminate."
-    }
+    })
     response = await moderations_handler.handle_request(mock_request)
     data = json.loads(response.body.decode())
     assert data["results"][0]["flagged"]
     assert data["results"][0]["categories"]["hate"]
     
     # Test violent content
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "input": "There was a violent fight with blood."
-    }
+    })
     response = await moderations_handler.handle_request(mock_request)
     data = json.loads(response.body.decode())
     assert data["results"][0]["flagged"]
@@ -213,18 +241,18 @@ async def test_moderations_score_thresholds(moderations_handler):
     mock_request.state.start_time = 1234567890
     
     # Test borderline content (single mention)
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "input": "One hate word."  # Single mention should be below threshold
-    }
+    })
     response = await moderations_handler.handle_request(mock_request)
     data = json.loads(response.body.decode())
     assert not data["results"][0]["flagged"]
     assert data["results"][0]["category_scores"]["hate"] < 0.5
     
     # Test clear violation (multiple mentions)
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "input": "Hate hate hate hate hate."  # Multiple mentions should exceed threshold
-    }
+    })
     response = await moderations_handler.handle_request(mock_request)
     data = json.loads(response.body.decode())
     assert data["results"][0]["flagged"]
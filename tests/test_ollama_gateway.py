@@ -1,3 +1,4 @@
+import orjson
 import pytest
 from httpx import AsyncClient
 import pytest_asyncio
@@ -37,9 +38,9 @@ async def test_gateway_initialization_invalid():
     config = OllamaConfig(
         name="test-ollama",
         base_path="/ollama/v1",
-        enabled=True
+        enabled=True,
+        host=None  # Make config invalid
     )
-    config.host = None  # Make config invalid
     
     with pytest.raises(ValueError, match="Ollama gateway requires host configuration"):
         OllamaGateway(config)
@@ -48,10 +49,10 @@ async def test_gateway_initialization_invalid():
 async def test_transform_request(ollama_gateway):
     """Test request transformation."""
     mock_request = AsyncMock()
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "llama2",
         "prompt": "Hello, world!"
-    }
+    })
     
     result = await ollama_gateway.transform_request(mock_request)
     assert result == {
@@ -63,13 +64,13 @@ async def test_transform_request(ollama_gateway):
 async def test_transform_request_with_mapping(ollama_gateway):
     """Test request transformation with model mapping."""
     # Add a model mapping
-    ollama_gateway.config.model_mappings = {"gpt-3.5-turbo": "llama2"}
+    ollama_gateway.config.model_mappings["gpt-3.5-turbo"] = "llama2"
     
     mock_request = AsyncMock()
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "gpt-3.5-turbo",
         "prompt": "Hello, world!"
-    }
+    })
     
     result = await ollama_gateway.transform_request(mock_request)
     assert result == {
@@ -1,6 +1,9 @@
 """Tests for the OpenAI gateway."""
 
 import json
+from dataclasses import replace
+
+import orjson
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from typing import AsyncGenerator, Dict
@@ -74,10 +77,10 @@ async def test_endpoint_routing(openai_gateway):
     """Test routing requests to appropriate endpoint handlers."""
     mock_request = AsyncMock()
     mock_request.url.path = "/openai/v1/embeddings"
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "input": "test",
         "model": "text-embedding-ada-002"
-    }
+    })
     
     # Mock handler responses
     mock_embeddings_response = JSONResponse(content={"test": "embeddings"})
@@ -131,7 +134,7 @@ async def test_transform_chat_completion_request(openai_gateway):
     mock_request = AsyncMock()
     mock_request.url.path = "/openai/v1/chat/completions"
     mock_request.state = MagicMock()
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "gpt-3.5-turbo",
         "messages": [
             {"role": "system", "content": "You are a helpful assistant."},
@@ -141,7 +144,7 @@ async def test_transform_chat_completion_request(openai_gateway):
         ],
         "temperature": 0.8,
         "stream": False
-    }
+    })
     
     result = await openai_gateway.transform_request(mock_request)
     assert result == {
@@ -159,12 +162,12 @@ async def test_transform_completion_request(openai_gateway):
     """Test completion request transformation."""
     mock_request = AsyncMock()
     mock_request.url.path = "/openai/v1/completions"
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "gpt-4",
         "prompt": "Translate 'hello' to French",
         "temperature": 0.5,
         "max_tokens": 100
-    }
+    })
     
     result = await openai_gateway.transform_request(mock_request)
     assert result == {
@@ -238,6 +241,31 @@ async def test_transform_streaming_response(openai_gateway):
     assert hasattr(mock_request.state, "completion_tokens")
     assert mock_request.state.completion_tokens > 0
 
+@pytest.mark.asyncio
+async def test_streaming_token_count_batched(openai_gateway):
+    """Test streamed chunks are counted in batches rather than one by one."""
+    mock_request = AsyncMock()
+    mock_request.state = MagicMock()
+    mock_request.state.model = "gpt-3.5-turbo"
+
+    async def chunks():
+        for i in range(10):
+            yield {"id": str(i), "response": "word ", "done": False}
+        yield {"id": "10", "response": "end", "done": True}
+
+    mock_count = AsyncMock(side_effect=lambda text, model: len(text.split()))
+    with patch.object(openai_gateway.token_counter, "count_tokens", mock_count):
+        result = await openai_gateway.transform_response(
+            {"stream": True, "chunks": chunks()},
+            mock_request
+        )
+        events = [event async for event in result.body_iterator]
+
+    assert len(events) == 12
+    assert events[-1] == b"data: [DONE]\n\n"
+    assert mock_count.await_count == 1
+    assert mock_request.state.completion_tokens == 11
+
 @pytest.mark.asyncio
 async def test_performance_config(openai_gateway):
     """Test performance configuration."""
@@ -268,17 +296,20 @@ async def test_endpoint_config(openai_gateway):
 async def test_token_counting_disabled(openai_config, openai_gateway):
     """Test behavior when token counting is disabled."""
     # Disable token counting
-    openai_config.token_counter.enabled = False
+    openai_config = replace(
+        openai_config,
+        token_counter=replace(openai_config.token_counter, enabled=False)
+    )
     gateway = OpenAIGateway(openai_config)
 
     mock_request = AsyncMock()
     mock_request.url.path = "/openai/v1/chat/completions"
     mock_request.state = MagicMock()
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "gpt-3.5-turbo",
         "messages": [{"role": "user", "content": "Hello"}],
         "stream": False
-    }
+    })
 
     # Transform request should not set prompt_tokens
     result = await gateway.transform_request(mock_request)
@@ -299,20 +330,16 @@ async def test_token_counting_disabled(openai_config, openai_gateway):
 @pytest.mark.asyncio
 async def test_get_status_healthy(openai_gateway):
     """Test status check with healthy response."""
-    mock_version_response = AsyncMock()
+    mock_version_response = MagicMock()
     mock_version_response.status_code = 200
-    mock_version_response.json = AsyncMock(return_value={"version": "1.0.0"})
-    mock_version_response.raise_for_status = AsyncMock()
-    mock_version_response.aread = AsyncMock()
+    mock_version_response.content = orjson.dumps({"version": "1.0.0"})
 
-    mock_tags_response = AsyncMock()
+    mock_tags_response = MagicMock()
     mock_tags_response.status_code = 200
-    mock_tags_response.json = AsyncMock(return_value=[
+    mock_tags_response.content = orjson.dumps([
         {"name": "llama2"},
         {"name": "llama2:70b"}
     ])
-    mock_tags_response.raise_for_status = AsyncMock()
-    mock_tags_response.aread = AsyncMock()
 
     with patch.object(openai_gateway.client, 'get') as mock_get:
         mock_get.side_effect = [mock_version_response, mock_tags_response]
@@ -332,11 +359,11 @@ async def test_token_counter_cache(openai_gateway):
     mock_request = AsyncMock()
     mock_request.url.path = "/openai/v1/completions"
     mock_request.state = MagicMock()
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "gpt-3.5-turbo",
         "prompt": "Hello, world!",
         "stream": False
-    }
+    })
 
     # First request should calculate tokens
     await openai_gateway.transform_request(mock_request)
@@ -376,7 +403,7 @@ async def test_handle_error_http_status(openai_gateway):
     from httpx import HTTPStatusError
     mock_response = AsyncMock()
     mock_response.status_code = 429
-    mock_response.json.return_value = {"error": "Rate limit exceeded"}
+    mock_response.body.return_value = orjson.dumps({"error": "Rate limit exceeded"})
     error = HTTPStatusError("Rate limit", request=AsyncMock(), response=mock_response)
     
     response = await openai_gateway.handle_error(error)
@@ -389,10 +416,10 @@ async def test_transform_request_invalid_model(openai_gateway):
     mock_request = AsyncMock()
     mock_request.url.path = "/openai/v1/completions"
     mock_request.state = MagicMock()
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "invalid-model",
         "prompt": "test"
-    }
+    })
     
     result = await openai_gateway.transform_request(mock_request)
     assert result["model"] == "invalid-model"  # Uses unmapped model name
@@ -403,10 +430,10 @@ async def test_transform_chat_request_empty_messages(openai_gateway):
     mock_request = AsyncMock()
     mock_request.url.path = "/openai/v1/chat/completions"
     mock_request.state = MagicMock()
-    mock_request.json.return_value = {
+    mock_request.body.return_value = orjson.dumps({
         "model": "gpt-3.5-turbo",
         "messages": []
-    }
+    })
     
     result = await openai_gateway.transform_request(mock_request)
     assert result["prompt"] == ""
@@ -424,6 +451,47 @@ async def test_get_status_unhealthy(openai_gateway):
         assert status["gateway_type"] == "openai"
         assert status["compatibility_mode"] is True
 
+@pytest.mark.asyncio
+async def test_get_status_cached(openai_gateway):
+    """Test status results are cached and served stale when refresh fails."""
+    healthy = {"status": "healthy", "models": [], "gateway_type": "openai"}
+    mock_fetch = AsyncMock(return_value=healthy)
+    with patch.object(openai_gateway, "_fetch_status", mock_fetch):
+        assert await openai_gateway.get_status() == healthy
+        assert await openai_gateway.get_status() == healthy
+        assert mock_fetch.await_count == 1
+
+        # Expire the cache and fail the refresh
+        openai_gateway._status_cache = (0.0, healthy)
+        mock_fetch.side_effect = Exception("Connection failed")
+        status = await openai_gateway.get_status()
+
+    assert status["status"] == "healthy"
+    assert status["stale"] is True
+
+@pytest.mark.asyncio
+async def test_get_status_returns_copies(openai_gateway):
+    """Test callers cannot modify the cached status."""
+    healthy = {"status": "healthy", "models": [], "gateway_type": "openai"}
+    with patch.object(openai_gateway, "_fetch_status", AsyncMock(return_value=healthy)):
+        status = await openai_gateway.get_status()
+        status["status"] = "modified"
+        status["models"].append({"id": "extra"})
+
+        cached = await openai_gateway.get_status()
+        assert cached["status"] == "healthy"
+        assert cached["models"] == []
+
+@pytest.mark.asyncio
+async def test_get_status_failure_backs_off(openai_gateway):
+    """Test a failed refresh is not retried on every call."""
+    mock_fetch = AsyncMock(side_effect=Exception("Connection failed"))
+    with patch.object(openai_gateway, "_fetch_status", mock_fetch):
+        assert (await openai_gateway.get_status())["status"] == "unhealthy"
+        assert (await openai_gateway.get_status())["status"] == "unhealthy"
+
+    assert mock_fetch.await_count == 1
+
 @pytest.mark.asyncio
 async def test_validate_auth(openai_gateway):
     """Test authentication validation in compatibility mode."""
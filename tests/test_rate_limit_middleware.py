@@ -12,7 +12,11 @@ from fastapi.responses import JSONResponse
 from fastapi.testclient import TestClient
 from redis import Redis, ConnectionError
 from sqlalchemy.orm import Session
+from starlette.applications import Starlette
 from starlette.datastructures import State, MutableHeaders
+from starlette.middleware import Middleware
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
 from starlette.types import Scope
 
 from parallama.middleware.rate_limit import RateLimitMiddleware
@@ -472,3 +476,174 @@ async def test_middleware_cleanup_on_shutdown():
         # Simulate cleanup
         await middleware.cleanup()
         assert cleanup_called
+
+class FakeRateLimitService:
+    """Rate limit service recording usage instead of writing it."""
+
+    usage = []
+    check_error = None
+
+    def __init__(self, db):
+        pass
+
+    async def check_rate_limit(self, user_id, gateway_type, tokens):
+        if self.check_error is not None:
+            raise self.check_error
+
+    async def record_usage(self, **kwargs):
+        self.usage.append(kwargs)
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def fake_service():
+    """Patch the middleware's rate limit service and database session."""
+    FakeRateLimitService.usage = []
+    FakeRateLimitService.check_error = None
+    db = MagicMock()
+    with patch("parallama.middleware.rate_limit.RateLimitService", FakeRateLimitService), \
+         patch("parallama.middleware.rate_limit.get_db", return_value=db):
+        yield FakeRateLimitService, db
+
+@pytest.fixture
+def asgi_states():
+    """Request state dicts left behind by the middleware, one per request."""
+    return []
+
+@pytest.fixture
+def asgi_client(fake_service, asgi_states) -> TestClient:
+    """Create a client for a plain Starlette app behind the middleware."""
+
+    async def ok(request):
+        request.state.tokens_used = 7
+        request.state.model_name = "llama2"
+        return JSONResponse({"status": "ok"})
+
+    async def overridden(request):
+        request.state.error_message = "Upstream failed"
+        request.state.status_code = 502
+        return JSONResponse({"status": "ok"})
+
+    async def boom(request):
+        raise RuntimeError("boom")
+
+    async def stream(request):
+        async def chunks():
+            yield b"a"
+            request.state.tokens_used = 3
+            yield b"b"
+        return StreamingResponse(chunks())
+
+    class StateRecorder:
+        """Keep each request's state after the middleware has finished."""
+
+        def __init__(self, app):
+            self.app = app
+
+        async def __call__(self, scope, receive, send):
+            await self.app(scope, receive, send)
+            if scope["type"] == "http":
+                asgi_states.append(dict(scope["state"]))
+
+    # Same position as in the application: inside the server error
+    # handler, outside the exception handlers and routes
+    app = Starlette(
+        routes=[
+            Route("/ollama/v1/ok", ok),
+            Route("/ollama/v1/overridden", overridden),
+            Route("/ollama/v1/boom", boom),
+            Route("/ollama/v1/stream", stream),
+        ],
+        middleware=[
+            Middleware(StateRecorder),
+            Middleware(
+                RateLimitMiddleware,
+                get_user_id=lambda request: uuid.UUID(int=1),
+                get_gateway_type=RateLimitMiddleware.get_gateway_type_from_path
+            ),
+        ]
+    )
+    return TestClient(app, raise_server_exceptions=False)
+
+def test_asgi_success_records_usage(asgi_client, fake_service):
+    """Test a successful request is recorded with its token count."""
+    service, db = fake_service
+    response = asgi_client.get("/ollama/v1/ok")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+    [usage] = service.usage
+    assert usage["status_code"] == 200
+    assert usage["tokens"] == 7
+    assert usage["model_name"] == "llama2"
+    assert usage["gateway_type"] == "ollama"
+    assert usage["error_message"] is None
+    db.close.assert_called_once()
+
+def test_asgi_error_message_overrides_response(asgi_client, fake_service):
+    """Test an error message set by the handler replaces its response."""
+    service, _ = fake_service
+    response = asgi_client.get("/ollama/v1/overridden")
+    assert response.status_code == 502
+    assert response.json() == {"detail": "Upstream failed"}
+
+    [usage] = service.usage
+    assert usage["status_code"] == 502
+    assert usage["error_message"] == "Upstream failed"
+
+def test_asgi_exception_before_response(asgi_client, fake_service):
+    """Test an exception before the response starts becomes a 500."""
+    service, _ = fake_service
+    response = asgi_client.get("/ollama/v1/boom")
+    assert response.status_code == 500
+    assert response.json() == {"detail": "boom"}
+
+    [usage] = service.usage
+    assert usage["status_code"] == 500
+    assert usage["error_message"] == "boom"
+
+def test_asgi_streaming_response(asgi_client, fake_service):
+    """Test a streamed body passes through and is recorded once complete."""
+    service, _ = fake_service
+    response = asgi_client.get("/ollama/v1/stream")
+    assert response.status_code == 200
+    assert response.content == b"ab"
+
+    # Tokens counted during streaming are included in the usage record
+    [usage] = service.usage
+    assert usage["tokens"] == 3
+
+def test_asgi_rate_limit_exceeded(asgi_client, fake_service):
+    """Test a rate limit rejection short-circuits the request."""
+    service, _ = fake_service
+    service.check_error = HTTPException(status_code=429, detail="Hourly token limit exceeded")
+    response = asgi_client.get("/ollama/v1/ok")
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Hourly token limit exceeded"}
+
+    [usage] = service.usage
+    assert usage["status_code"] == 429
+    assert usage["tokens"] is None
+
+def test_asgi_redis_unavailable(asgi_client, fake_service):
+    """Test a Redis outage short-circuits with a 503."""
+    service, _ = fake_service
+    service.check_error = redis.ConnectionError("Connection refused")
+    response = asgi_client.get("/ollama/v1/ok")
+    assert response.status_code == 503
+    assert response.json() == {"detail": "Rate limiting service unavailable"}
+
+    [usage] = service.usage
+    assert usage["status_code"] == 503
+
+def test_asgi_state_cleanup(asgi_client, asgi_states):
+    """Test per-request state is removed once the request completes."""
+    asgi_client.get("/ollama/v1/ok")
+    asgi_client.get("/ollama/v1/boom")
+
+    assert len(asgi_states) == 2
+    for state in asgi_states:
+        for key in ("start_time", "start_counter", "tokens_used", "model_name",
+                    "error_message", "status_code", "gateway_type"):
+            assert key not in state
@@ -52,6 +52,21 @@ async def test_token_cache(token_counter):
     assert count1 == count2
     assert stats2["hits"] > stats1["hits"]
 
+@pytest.mark.asyncio
+async def test_count_tokens_batch(token_counter):
+    """Test batch counting matches per-text counting and uses the cache."""
+    texts = ["Hello, world!", "Another message", "Hello, world!"]
+
+    counts = await token_counter.count_tokens_batch(texts, "gpt-3.5-turbo")
+    assert counts == [
+        await token_counter.count_tokens(text, "gpt-3.5-turbo")
+        for text in texts
+    ]
+    # Duplicates are encoded once; the follow-up single counts are hits
+    stats = token_counter.get_cache_stats()
+    assert stats["misses"] == 2
+    assert stats["hits"] == 3
+
 @pytest.mark.asyncio
 async def test_different_models(token_counter):
     """Test token counting with different models."""